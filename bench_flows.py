@@ -0,0 +1,96 @@
+"""Deterministic benchmark of the A → B → C scripts against the in-process fake node.
+
+Runs the real main() of legacy_AB/BC.py and segwit_AB/BC.py with each module's
+AuthServiceProxy routed to a FakeNode, so client-side changes to the scripts show
+up in the numbers. Reports wall time and RPC call counts per script; call counts
+do not depend on timing, so CI can compare them across changes.
+
+    python bench_flows.py --runs 20 --latency 0.001
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import re
+import tempfile
+import time
+
+from fake_node import FakeNode
+
+FLOWS = (("legacy_AB", "legacy_BC"), ("segwit_AB", "segwit_BC"))
+
+
+def node_service_proxy(node):
+    """Build an AuthServiceProxy replacement that routes a script's connections to node."""
+
+    def connect(service_url, *args, **kwargs):
+        match = re.search(r"/wallet/([^/]+)/?$", service_url)
+        return node.proxy(match.group(1) if match else None)
+
+    return connect
+
+
+def run_script(node, name):
+    """Run a script's main() against node, returning {method: calls} for that run.
+
+    Address files are read and written in the current directory, as when the
+    scripts are run by hand; the AB script must run before its BC script.
+    """
+    module = importlib.import_module(name)
+    before = dict(node.call_counts)
+    original = module.AuthServiceProxy
+    module.AuthServiceProxy = node_service_proxy(node)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.main()
+    finally:
+        module.AuthServiceProxy = original
+    return {method: count - before.get(method, 0) for method, count in node.call_counts.items()
+            if count != before.get(method, 0)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scripts against the fake node.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every RPC call")
+    args = parser.parse_args()
+
+    node = FakeNode(latency=args.latency)
+    wallet_rpc = node.proxy("project")
+    wallet_rpc.generatetoaddress(101, wallet_rpc.getnewaddress())
+
+    elapsed = {}
+    calls = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            for _ in range(args.runs):
+                for flow in FLOWS:
+                    for name in flow:
+                        start = time.perf_counter()
+                        counts = run_script(node, name)
+                        elapsed[name] = elapsed.get(name, 0.0) + time.perf_counter() - start
+                        for method, count in counts.items():
+                            calls.setdefault(name, {})[method] = calls.get(name, {}).get(method, 0) + count
+        finally:
+            os.chdir(cwd)
+
+    print("------------------------------------------------------------")
+    print("| SCRIPT               | RUNS | TIME (s)  | RPC CALLS / RUN")
+    print("------------------------------------------------------------")
+    for flow in FLOWS:
+        for name in flow:
+            total = sum(calls[name].values())
+            print(f"| {name:<20} | {args.runs:<4} | {elapsed[name]:<9.4f} | {total / args.runs:g}")
+    print("------------------------------------------------------------")
+    for flow in FLOWS:
+        for name in flow:
+            breakdown = ", ".join(f"{method} {count / args.runs:g}" for method, count in sorted(calls[name].items()))
+            print(f"| {name:<20} | {breakdown}")
+    print("------------------------------------------------------------")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Push-style capture of mined transactions for tracked addresses.
+
+Rather than polling individual txids with `get_script_info` after each broadcast,
+BlockFollower tracks the chain tip with `getbestblockhash` and fetches each new
+block once by height as raw hex (`getblock` verbosity 0), decoding it locally. Every
+transaction is emitted exactly once, even across reorgs, so capture cost scales
+with the number of blocks rather than the number of txids queried.
+
+    follower = BlockFollower(rpc_connection)
+    txs = follower.follow(poll_interval=1.0)
+    for record in extract_scripts(txs, [addr_a, addr_b, addr_c]):
+        print(record["kind"], record["txid"], record["locking_script_asm"])
+"""
+import time
+from collections import deque
+
+import txcodec
+
+REORG_WINDOW = 100  # blocks of history kept for rewinding and de-duplication (not a catch-up limit)
+
+
+class ReorgTooDeepError(Exception):
+    """The new tip does not connect to any block within REORG_WINDOW."""
+
+
+class BlockFollower:
+    """Follows the active chain and yields each newly mined transaction once.
+
+    start_hash is the last block considered already processed; by default the
+    follower starts from the tip at the first poll and only reports later blocks.
+    """
+
+    def __init__(self, rpc_connection, start_hash=None, reorg_window=REORG_WINDOW):
+        self.rpc = rpc_connection
+        self.reorg_window = reorg_window
+        self.reorgs = 0
+        self.blocks_fetched = 0
+        self._chain = deque()   # (hash, height, txids) of processed blocks, oldest first
+        self._heights = {}      # block hash -> height for blocks in _chain
+        self._seen = {}         # txid -> number of processed blocks containing it
+        self._start_hash = start_hash
+        self._partial = None    # (block_hash, txids delivered) for a block not fully consumed
+
+    @property
+    def tip(self):
+        return self._chain[-1][0] if self._chain else None
+
+    def _fetch(self, block_hash):
+        raw = self.rpc.getblock(block_hash, 0)
+        self.blocks_fetched += 1
+        return txcodec.parse_block(raw)
+
+    def _init_chain(self):
+        start = self._start_hash or self.rpc.getbestblockhash()
+        self._connect(start, self.rpc.getblockheader(start)["height"], [])
+
+    def _connect(self, block_hash, height, txids):
+        self._chain.append((block_hash, height, txids))
+        self._heights[block_hash] = height
+        for txid in txids:
+            self._seen[txid] = self._seen.get(txid, 0) + 1
+        while len(self._chain) > self.reorg_window:
+            old_hash, _, old_txids = self._chain.popleft()
+            del self._heights[old_hash]
+            self._forget(old_txids)
+
+    def _forget(self, txids):
+        for txid in txids:
+            self._seen[txid] -= 1
+            if not self._seen[txid]:
+                del self._seen[txid]
+
+    def _rewind(self, fork_hash):
+        """Drop processed blocks above fork_hash; their txids stay marked as emitted."""
+        self.reorgs += 1
+        while self._chain[-1][0] != fork_hash:
+            block_hash, _, txids = self._chain.pop()
+            del self._heights[block_hash]
+            # Keep disconnected txids in _seen until they age out of the window,
+            # so transactions re-mined on the new branch are not emitted again
+            self._chain[-1] = (self._chain[-1][0], self._chain[-1][1], self._chain[-1][2] + txids)
+
+    def _fork_height(self, best_height):
+        """Highest processed height whose hash is still on the active chain."""
+        base = self._chain[0][1]
+        height = min(self._chain[-1][1], best_height)
+        while height >= base:
+            if self.rpc.getblockhash(height) == self._chain[height - base][0]:
+                return height
+            height -= 1
+        raise ReorgTooDeepError(f"Active chain does not connect within {self.reorg_window} blocks")
+
+    def poll(self):
+        """Yield (height, block_hash, txid, tx) for every transaction mined since the last poll."""
+        if not self._chain:
+            self._init_chain()
+        if self.rpc.getbestblockhash() == self.tip:
+            return
+
+        # Only blocks at or below our last processed height can have been replaced
+        best_height = self.rpc.getblockcount()
+        fork_height = self._fork_height(best_height)
+        if fork_height < self._chain[-1][1]:
+            self._rewind(self._chain[fork_height - self._chain[0][1]][0])
+
+        # Then catch up forward by height, however far behind we are
+        for height in range(fork_height + 1, best_height + 1):
+            block_hash = self.rpc.getblockhash(height)
+            header, txs = self._fetch(block_hash)
+            if header["previousblockhash"] != self.tip:
+                return  # the chain moved while catching up; the next poll resolves it
+            txids = [txcodec.txid_of(tx) for tx in txs]
+            yield from self._emit_block(block_hash, txids, txs, height)
+            self._connect(block_hash, height, txids)
+
+    def _emit_block(self, block_hash, txids, txs, height):
+        """Yield a block's unseen txs, remembering what was delivered if the consumer stops early."""
+        if self._partial is not None and self._partial[0] != block_hash:
+            # A partly delivered block was replaced; keep its delivered txids marked as emitted
+            self._chain[-1] = (self._chain[-1][0], self._chain[-1][1], self._chain[-1][2] + self._partial[1])
+            for txid in self._partial[1]:
+                self._seen[txid] = self._seen.get(txid, 0) + 1
+            self._partial = None
+        delivered = set(self._partial[1]) if self._partial is not None else set()
+        self._partial = (block_hash, list(delivered))
+        for txid, tx in zip(txids, txs):
+            if txid in self._seen or txid in delivered:
+                continue
+            self._partial[1].append(txid)
+            yield height, block_hash, txid, tx
+        self._partial = None
+
+    def follow(self, poll_interval=1.0, stop=None):
+        """Poll forever (or until stop() is true), yielding new transactions as they are mined."""
+        while stop is None or not stop():
+            emitted = False
+            for item in self.poll():
+                emitted = True
+                yield item
+            if not emitted:
+                time.sleep(poll_interval)
+
+
+def extract_scripts(transactions, addresses, outpoints=None):
+    """Turn (height, block_hash, txid, tx) items into script records for tracked addresses.
+
+    Yields an "output" record with the locking script for every output paying a
+    tracked address, and an "input" record with the unlocking script and witness
+    for every input spending one. Outputs created before following started can be
+    supplied as outpoints: {(txid, vout): address}.
+    """
+    tracked = {txcodec.address_to_script(a): a for a in addresses}
+    owned = dict(outpoints or {})
+    for height, block_hash, txid, tx in transactions:
+        if not txcodec.is_coinbase(tx):
+            for n, txin in enumerate(tx["vin"]):
+                address = owned.pop((txin["txid"], txin["vout"]), None)
+                if address is None:
+                    continue
+                yield {
+                    "kind": "input",
+                    "txid": txid,
+                    "n": n,
+                    "height": height,
+                    "blockhash": block_hash,
+                    "address": address,
+                    "prevout": (txin["txid"], txin["vout"]),
+                    "unlocking_script_hex": txin["scriptSig"].hex(),
+                    "unlocking_script_asm": txcodec.script_to_asm(txin["scriptSig"], attempt_sighash_decode=True),
+                    "witness_data": [item.hex() for item in txin["witness"]],
+                }
+        for n, txout in enumerate(tx["vout"]):
+            address = tracked.get(txout["scriptPubKey"])
+            if address is None:
+                continue
+            owned[(txid, n)] = address
+            yield {
+                "kind": "output",
+                "txid": txid,
+                "n": n,
+                "height": height,
+                "blockhash": block_hash,
+                "address": address,
+                "amount": txcodec.sats_to_btc(txout["value"]),
+                "locking_script_hex": txout["scriptPubKey"].hex(),
+                "locking_script_asm": txcodec.script_to_asm(txout["scriptPubKey"]),
+                "script_type": txcodec.script_type(txout["scriptPubKey"]),
+            }
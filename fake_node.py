@@ -0,0 +1,674 @@
+"""In-process stand-in for `bitcoind -regtest` serving the RPC subset used by the scripts.
+
+The node keeps a real (but unvalidated) chain of serialized blocks, a UTXO set and a
+mempool, so txids, raw hex and decoded transactions are consistent across calls.
+Keys and signatures are fake: signing produces correctly shaped scriptSig/witness
+data, but nothing is cryptographically verified.
+
+Use it in-process:
+
+    node = FakeNode(latency=0.002)
+    wallet_rpc = node.proxy("project")
+    wallet_rpc.generatetoaddress(101, wallet_rpc.getnewaddress())
+
+or serve it over HTTP so the scripts can run unmodified:
+
+    python fake_node.py --port 18443 --premine 101
+"""
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import txcodec
+
+try:
+    from bitcoinrpc.authproxy import JSONRPCException
+except ImportError:
+    class JSONRPCException(Exception):
+        """Mirror of bitcoinrpc's exception: carries the RPC error object in .error."""
+
+        def __init__(self, rpc_error):
+            super().__init__(f"{rpc_error['code']}: {rpc_error['message']}")
+            self.error = rpc_error
+            self.code = rpc_error["code"]
+            self.message = rpc_error["message"]
+
+# Core's RPC error codes
+RPC_MISC_ERROR = -1
+RPC_TYPE_ERROR = -3
+RPC_INVALID_ADDRESS_OR_KEY = -5
+RPC_INVALID_PARAMETER = -8
+RPC_DESERIALIZATION_ERROR = -22
+RPC_VERIFY_ERROR = -25
+RPC_VERIFY_REJECTED = -26
+RPC_VERIFY_ALREADY_IN_CHAIN = -27
+RPC_METHOD_NOT_FOUND = -32601
+RPC_WALLET_INSUFFICIENT_FUNDS = -6
+RPC_WALLET_NOT_FOUND = -18
+RPC_WALLET_NOT_SPECIFIED = -19
+RPC_WALLET_ALREADY_LOADED = -35
+
+COINBASE_MATURITY = 100
+SUBSIDY_HALVING_INTERVAL = 150  # regtest
+GENESIS_TIME = 1296688602
+BLOCK_INTERVAL = 600
+REGTEST_BITS = 0x207fffff
+DEFAULT_FEE_RATE = 10  # sat/vB, i.e. paytxfee=0.0001 BTC/kvB
+DEFAULT_SEQUENCE = 0xfffffffd
+
+# Methods that operate on a wallet; everything else is node-level
+WALLET_METHODS = {
+    "getnewaddress", "getbalance", "listunspent", "sendtoaddress",
+    "signrawtransactionwithwallet",
+}
+
+
+def rpc_error(code, message):
+    """Build the exception raised for a failed call."""
+    return JSONRPCException({"code": code, "message": message})
+
+
+class Wallet:
+    """Deterministic fake-key wallet: tracks owned scripts and their signing data."""
+
+    def __init__(self, name, seed):
+        self.name = name
+        self.seed = seed
+        self.counter = 0
+        self.scripts = {}  # scriptPubKey bytes -> {"pubkey", "type", "label"}
+
+    def new_key(self, address_type, label=""):
+        self.counter += 1
+        priv = hashlib.sha256(f"{self.seed}/{self.name}/{self.counter}".encode()).digest()
+        pubkey = b"\x02" + hashlib.sha256(priv).digest()
+        # Opaque 20-byte key id; real nodes use HASH160(pubkey), which nothing here verifies
+        key_hash = txcodec.sha256d(pubkey)[:20]
+        if address_type == "legacy":
+            script = txcodec.p2pkh_script(key_hash)
+            redeem_script = None
+        elif address_type == "p2sh-segwit":
+            redeem_script = txcodec.p2wpkh_script(key_hash)
+            script = txcodec.p2sh_script(txcodec.sha256d(redeem_script)[:20])
+        elif address_type == "bech32":
+            script = txcodec.p2wpkh_script(key_hash)
+            redeem_script = None
+        else:
+            raise rpc_error(RPC_INVALID_PARAMETER, f"Unknown address type '{address_type}'")
+        self.scripts[script] = {"priv": priv, "pubkey": pubkey, "type": address_type,
+                                "redeem_script": redeem_script, "label": label}
+        return script
+
+    def sign_input(self, tx, index, script):
+        """Fill in scriptSig/witness for input `index` spending `script`; False if not ours."""
+        key = self.scripts.get(script)
+        if key is None:
+            return False
+        digest = hashlib.sha256(key["priv"] + txcodec.serialize_tx(tx, include_witness=False)
+                                + index.to_bytes(4, "little")).digest()
+        r = hashlib.sha256(digest + b"r").digest()
+        s = hashlib.sha256(digest + b"s").digest()
+        # DER-shaped signature with SIGHASH_ALL; high bits cleared so no padding is needed
+        sig = (b"\x30\x44\x02\x20" + bytes([r[0] & 0x7f]) + r[1:]
+               + b"\x02\x20" + bytes([s[0] & 0x3f]) + s[1:] + b"\x01")
+        txin = tx["vin"][index]
+        if key["type"] == "legacy":
+            txin["scriptSig"] = txcodec.push_data(sig) + txcodec.push_data(key["pubkey"])
+            txin["witness"] = []
+        elif key["type"] == "p2sh-segwit":
+            txin["scriptSig"] = txcodec.push_data(key["redeem_script"])
+            txin["witness"] = [sig, key["pubkey"]]
+        else:
+            txin["scriptSig"] = b""
+            txin["witness"] = [sig, key["pubkey"]]
+        return True
+
+
+class FakeNode:
+    """In-memory regtest node with configurable per-call latency.
+
+    latency is added to every call (seconds); method_latency overrides it per method.
+    """
+
+    def __init__(self, latency=0.0, method_latency=None, wallets=("project",), seed="regtest"):
+        self.latency = latency
+        self.method_latency = dict(method_latency or {})
+        self.seed = seed
+        self.lock = threading.RLock()
+        self.call_counts = {}
+
+        self.wallets = {name: Wallet(name, seed) for name in wallets}
+        self.loaded = list(wallets)
+        self.blocks = []         # [{"hash", "header", "txs", "txids", "height"}]
+        self.block_index = {}    # block hash -> block, including blocks no longer on the active chain
+        self.tx_index = {}       # txid -> (tx, block height)
+        self.utxos = {}          # (txid, vout) -> {"value", "script", "height", "coinbase"}
+        self.mempool = {}        # txid -> tx
+        self.mempool_spends = {}  # (txid, vout) -> spending txid
+        self._mine_block(b"\x6a")  # genesis pays to an unspendable script
+
+    # ------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------
+
+    def call(self, method, params=(), wallet=None):
+        """Execute one RPC call, applying injected latency first."""
+        delay = self.method_latency.get(method, self.latency)
+        if delay:
+            time.sleep(delay)
+        handler = getattr(self, "rpc_" + method, None)
+        if handler is None:
+            raise rpc_error(RPC_METHOD_NOT_FOUND, "Method not found")
+        with self.lock:
+            self.call_counts[method] = self.call_counts.get(method, 0) + 1
+            if method in WALLET_METHODS:
+                return handler(self._wallet(wallet), *params)
+            return handler(*params)
+
+    def proxy(self, wallet=None):
+        """Return an AuthServiceProxy-like object bound to this node (and wallet)."""
+        return FakeNodeProxy(self, wallet)
+
+    def _wallet(self, name):
+        if name is None:
+            if len(self.loaded) != 1:
+                raise rpc_error(RPC_WALLET_NOT_SPECIFIED,
+                                "Wallet file not specified (must request wallet RPC through /wallet/<filename> uri-path).")
+            name = self.loaded[0]
+        if name not in self.loaded:
+            raise rpc_error(RPC_WALLET_NOT_FOUND, "Requested wallet does not exist or is not loaded")
+        return self.wallets[name]
+
+    # ------------------------------------------------------------
+    # Chain state
+    # ------------------------------------------------------------
+
+    @property
+    def height(self):
+        return len(self.blocks) - 1
+
+    def _lookup_prevout(self, txid, vout):
+        """Find an unspent output in the UTXO set or the mempool."""
+        utxo = self.utxos.get((txid, vout))
+        if utxo is not None:
+            return utxo
+        tx = self.mempool.get(txid)
+        if tx is not None and vout < len(tx["vout"]):
+            out = tx["vout"][vout]
+            return {"value": out["value"], "script": out["scriptPubKey"], "height": None, "coinbase": False}
+        return None
+
+    def _confirmations(self, height):
+        return 0 if height is None else self.height - height + 1
+
+    def _subsidy(self, height):
+        halvings = height // SUBSIDY_HALVING_INTERVAL
+        return 0 if halvings >= 64 else (50 * txcodec.COIN) >> halvings
+
+    def _mine_block(self, coinbase_script):
+        height = len(self.blocks)
+        txs = list(self.mempool.values())
+        fees = 0
+        for tx in txs:
+            value_in = sum(self._lookup_prevout(i["txid"], i["vout"])["value"] for i in tx["vin"])
+            fees += value_in - sum(o["value"] for o in tx["vout"])
+
+        # BIP34 height push in the coinbase scriptSig
+        height_bytes = height.to_bytes((height.bit_length() + 8) // 8, "little") if height else b""
+        coinbase = {
+            "version": 2, "locktime": 0,
+            "vin": [{"txid": "00" * 32, "vout": 0xffffffff,
+                     "scriptSig": txcodec.push_data(height_bytes) + b"\x00" if height else b"\x00\x00",
+                     "sequence": 0xffffffff, "witness": []}],
+            "vout": [{"value": self._subsidy(height) + fees, "scriptPubKey": coinbase_script}],
+        }
+        txs.insert(0, coinbase)
+        txids = [txcodec.txid_of(tx) for tx in txs]
+        header = {
+            "version": 0x20000000,
+            "previousblockhash": self.blocks[-1]["hash"] if self.blocks else "00" * 32,
+            "merkleroot": txcodec.merkle_root(txids),
+            "time": GENESIS_TIME + height * BLOCK_INTERVAL,
+            "bits": REGTEST_BITS,
+            "nonce": len(self.block_index),  # keeps replacement blocks distinct after a reorg
+        }
+        block_hash = txcodec.sha256d(txcodec.serialize_header(header))[::-1].hex()
+
+        undo = []  # per tx: spent (outpoint, utxo) pairs, restored if the block is disconnected
+        for tx, txid in zip(txs, txids):
+            spent = []
+            if not txcodec.is_coinbase(tx):
+                for txin in tx["vin"]:
+                    outpoint = (txin["txid"], txin["vout"])
+                    if outpoint in self.utxos:
+                        spent.append((outpoint, self.utxos.pop(outpoint)))
+            undo.append(spent)
+            for n, out in enumerate(tx["vout"]):
+                if out["scriptPubKey"][:1] != b"\x6a":
+                    self.utxos[(txid, n)] = {"value": out["value"], "script": out["scriptPubKey"],
+                                             "height": height, "coinbase": n == 0 and tx is coinbase}
+            self.tx_index[txid] = (tx, height)
+
+        block = {"hash": block_hash, "header": header, "txs": txs,
+                 "txids": txids, "height": height, "undo": undo}
+        self.blocks.append(block)
+        self.block_index[block_hash] = block
+        self.mempool.clear()
+        self.mempool_spends.clear()
+        return block_hash
+
+    def _disconnect_tip(self):
+        """Undo the tip block, returning its non-coinbase transactions."""
+        block = self.blocks.pop()
+        # Reverse order, so an output created and spent within the block is not restored
+        for txid, tx, spent in reversed(list(zip(block["txids"], block["txs"], block["undo"]))):
+            for n in range(len(tx["vout"])):
+                self.utxos.pop((txid, n), None)
+            self.tx_index.pop(txid, None)
+            for outpoint, utxo in spent:
+                self.utxos[outpoint] = utxo
+        return block["txs"][1:]
+
+    def _wallet_coins(self, wallet, minconf=1, maxconf=9999999):
+        """Yield (txid, vout, utxo, confirmations) for spendable wallet outputs."""
+        candidates = [(k, v) for k, v in self.utxos.items()]
+        for txid, tx in self.mempool.items():
+            for n, out in enumerate(tx["vout"]):
+                candidates.append(((txid, n), {"value": out["value"], "script": out["scriptPubKey"],
+                                               "height": None, "coinbase": False}))
+        for (txid, n), utxo in candidates:
+            if utxo["script"] not in wallet.scripts or (txid, n) in self.mempool_spends:
+                continue
+            confirmations = self._confirmations(utxo["height"])
+            if utxo["coinbase"] and confirmations <= COINBASE_MATURITY:
+                continue
+            if minconf <= confirmations <= maxconf:
+                yield txid, n, utxo, confirmations
+
+    def _is_trusted(self, wallet, txid):
+        """A mempool transaction is trusted if the wallet funded every input (as Core does)."""
+        return all(self._lookup_prevout(txin["txid"], txin["vout"]) is not None
+                   and self._lookup_prevout(txin["txid"], txin["vout"])["script"] in wallet.scripts
+                   for txin in self.mempool[txid]["vin"])
+
+    def _accept_to_mempool(self, tx):
+        txid = txcodec.txid_of(tx)
+        if txid in self.tx_index:
+            raise rpc_error(RPC_VERIFY_ALREADY_IN_CHAIN, "Transaction already in block chain")
+        if txid in self.mempool:
+            return txid
+        value_in = 0
+        for txin in tx["vin"]:
+            outpoint = (txin["txid"], txin["vout"])
+            prevout = self._lookup_prevout(*outpoint)
+            if prevout is None:
+                raise rpc_error(RPC_VERIFY_ERROR, "bad-txns-inputs-missingorspent")
+            if outpoint in self.mempool_spends:
+                raise rpc_error(RPC_VERIFY_REJECTED, "txn-mempool-conflict")
+            if prevout["coinbase"] and self._confirmations(prevout["height"]) < COINBASE_MATURITY:
+                raise rpc_error(RPC_VERIFY_REJECTED, "bad-txns-premature-spend-of-coinbase")
+            if not txin["scriptSig"] and not txin["witness"]:
+                raise rpc_error(RPC_VERIFY_REJECTED, "mandatory-script-verify-flag-failed (Operation not valid with the current stack size)")
+            value_in += prevout["value"]
+        value_out = sum(out["value"] for out in tx["vout"])
+        if value_out > value_in:
+            raise rpc_error(RPC_VERIFY_REJECTED, "bad-txns-in-belowout")
+        if value_in - value_out < txcodec.tx_vsize(tx):
+            raise rpc_error(RPC_VERIFY_REJECTED, "min relay fee not met")
+        self.mempool[txid] = tx
+        for txin in tx["vin"]:
+            self.mempool_spends[(txin["txid"], txin["vout"])] = txid
+        return txid
+
+    def _sign(self, wallet, tx):
+        """Sign every input the wallet owns; return a list of per-input errors."""
+        errors = []
+        for i, txin in enumerate(tx["vin"]):
+            prevout = self._lookup_prevout(txin["txid"], txin["vout"])
+            if prevout is None:
+                errors.append({"txid": txin["txid"], "vout": txin["vout"],
+                               "error": "Input not found or already spent"})
+            elif not wallet.sign_input(tx, i, prevout["script"]):
+                errors.append({"txid": txin["txid"], "vout": txin["vout"],
+                               "error": "Unable to sign input, invalid stack size (possibly missing key)"})
+        return errors
+
+    @staticmethod
+    def _parse_address(address):
+        try:
+            return txcodec.address_to_script(address)
+        except ValueError:
+            raise rpc_error(RPC_INVALID_ADDRESS_OR_KEY, f"Invalid Bitcoin address: {address}")
+
+    # ------------------------------------------------------------
+    # Node RPCs
+    # ------------------------------------------------------------
+
+    def rpc_listwallets(self):
+        return list(self.loaded)
+
+    def rpc_createwallet(self, wallet_name, *args):
+        if wallet_name in self.wallets:
+            raise rpc_error(RPC_WALLET_ALREADY_LOADED, f"Wallet \"{wallet_name}\" already exists.")
+        self.wallets[wallet_name] = Wallet(wallet_name, self.seed)
+        self.loaded.append(wallet_name)
+        return {"name": wallet_name, "warning": ""}
+
+    def rpc_loadwallet(self, filename, *args):
+        if filename not in self.wallets:
+            raise rpc_error(RPC_WALLET_NOT_FOUND, f"Wallet file verification failed. Failed to load database path '{filename}'. Path does not exist.")
+        if filename in self.loaded:
+            raise rpc_error(RPC_WALLET_ALREADY_LOADED, f"Wallet \"{filename}\" is already loaded.")
+        self.loaded.append(filename)
+        return {"name": filename, "warning": ""}
+
+    def rpc_createrawtransaction(self, inputs, outputs, locktime=0, replaceable=True):
+        vin = []
+        for txin in inputs:
+            sequence = txin.get("sequence", DEFAULT_SEQUENCE if replaceable else 0xffffffff)
+            vin.append({"txid": txin["txid"], "vout": int(txin["vout"]), "scriptSig": b"",
+                        "sequence": sequence, "witness": []})
+        if isinstance(outputs, dict):
+            outputs = [{k: v} for k, v in outputs.items()]
+        vout = []
+        for output in outputs:
+            for key, value in output.items():
+                if key == "data":
+                    vout.append({"value": 0, "scriptPubKey": b"\x6a" + txcodec.push_data(bytes.fromhex(value))})
+                else:
+                    vout.append({"value": txcodec.btc_to_sats(value), "scriptPubKey": self._parse_address(key)})
+        tx = {"version": 2, "locktime": int(locktime), "vin": vin, "vout": vout}
+        return txcodec.serialize_tx(tx).hex()
+
+    def rpc_decoderawtransaction(self, hexstring, *args):
+        try:
+            tx = txcodec.parse_tx(hexstring)
+        except ValueError:
+            raise rpc_error(RPC_DESERIALIZATION_ERROR, "TX decode failed")
+        return txcodec.decode_tx(tx)
+
+    def rpc_sendrawtransaction(self, hexstring, *args):
+        try:
+            tx = txcodec.parse_tx(hexstring)
+        except ValueError:
+            raise rpc_error(RPC_DESERIALIZATION_ERROR, "TX decode failed. Make sure the tx has at least one input.")
+        return self._accept_to_mempool(tx)
+
+    def rpc_getrawtransaction(self, txid, verbose=False, blockhash=None):
+        if txid in self.mempool:
+            tx, height = self.mempool[txid], None
+        elif txid in self.tx_index:
+            tx, height = self.tx_index[txid]
+        else:
+            raise rpc_error(RPC_INVALID_ADDRESS_OR_KEY,
+                            "No such mempool or blockchain transaction. Use gettransaction for wallet transactions.")
+        raw = txcodec.serialize_tx(tx).hex()
+        if not verbose:
+            return raw
+        result = txcodec.decode_tx(tx)
+        result["hex"] = raw
+        if height is not None:
+            block = self.blocks[height]
+            result.update({"blockhash": block["hash"], "confirmations": self._confirmations(height),
+                           "time": block["header"]["time"], "blocktime": block["header"]["time"]})
+        return result
+
+    def rpc_getblockhash(self, height):
+        if not 0 <= height <= self.height:
+            raise rpc_error(RPC_INVALID_PARAMETER, "Block height out of range")
+        return self.blocks[height]["hash"]
+
+    def rpc_getblock(self, blockhash, verbosity=1):
+        block = self.block_index.get(blockhash)
+        if block is None:
+            raise rpc_error(RPC_INVALID_ADDRESS_OR_KEY, "Block not found")
+        raw = txcodec.serialize_block(block["header"], block["txs"])
+        if verbosity == 0:
+            return raw.hex()
+        result = self._header_json(block)
+        result.update({"size": len(raw), "tx": list(block["txids"])})
+        return result
+
+    def rpc_getblockheader(self, blockhash, verbose=True):
+        block = self.block_index.get(blockhash)
+        if block is None:
+            raise rpc_error(RPC_INVALID_ADDRESS_OR_KEY, "Block not found")
+        if not verbose:
+            return txcodec.serialize_header(block["header"]).hex()
+        return self._header_json(block)
+
+    def _header_json(self, block):
+        """Header fields shared by getblock and getblockheader."""
+        active = block["height"] < len(self.blocks) and self.blocks[block["height"]] is block
+        result = {"hash": block["hash"], "confirmations": self._confirmations(block["height"]) if active else -1,
+                  "height": block["height"], "version": block["header"]["version"],
+                  "merkleroot": block["header"]["merkleroot"], "time": block["header"]["time"],
+                  "nonce": block["header"]["nonce"], "bits": f"{block['header']['bits']:08x}",
+                  "nTx": len(block["txs"])}
+        if block["height"]:
+            result["previousblockhash"] = block["header"]["previousblockhash"]
+        if active and block["height"] < self.height:
+            result["nextblockhash"] = self.blocks[block["height"] + 1]["hash"]
+        return result
+
+    def rpc_invalidateblock(self, blockhash):
+        """Disconnect blockhash and its descendants, returning their transactions to the mempool."""
+        block = self.block_index.get(blockhash)
+        if block is None:
+            raise rpc_error(RPC_INVALID_ADDRESS_OR_KEY, "Block not found")
+        if block["height"] == 0:
+            raise rpc_error(RPC_MISC_ERROR, "Cannot invalidate the genesis block")
+        if not (block["height"] <= self.height and self.blocks[block["height"]] is block):
+            return None
+        disconnected = []
+        while self.height >= block["height"]:
+            disconnected = self._disconnect_tip() + disconnected
+        pending = disconnected + list(self.mempool.values())
+        self.mempool.clear()
+        self.mempool_spends.clear()
+        for tx in pending:
+            try:
+                self._accept_to_mempool(tx)
+            except JSONRPCException:
+                pass
+        return None
+
+    def rpc_getbestblockhash(self):
+        return self.blocks[-1]["hash"]
+
+    def rpc_getblockcount(self):
+        return self.height
+
+    def rpc_scantxoutset(self, action, scanobjects=None):
+        if action in ("status", "abort"):
+            return None if action == "status" else False
+        if action != "start":
+            raise rpc_error(RPC_INVALID_PARAMETER, "Invalid action '" + str(action) + "'")
+        # Only addr() and raw() descriptors are supported; fake keys have no real pubkey hashes
+        scripts = set()
+        for obj in scanobjects or []:
+            desc = (obj["desc"] if isinstance(obj, dict) else obj).split("#", 1)[0]
+            if desc.startswith("addr(") and desc.endswith(")"):
+                scripts.add(self._parse_address(desc[5:-1]))
+            elif desc.startswith("raw(") and desc.endswith(")"):
+                scripts.add(bytes.fromhex(desc[4:-1]))
+            else:
+                raise rpc_error(RPC_INVALID_PARAMETER, f"Unsupported descriptor in fake node: {desc}")
+        unspents = []
+        for (txid, n), utxo in self.utxos.items():
+            if utxo["script"] in scripts:
+                unspents.append({"txid": txid, "vout": n, "scriptPubKey": utxo["script"].hex(),
+                                 "desc": txcodec.infer_descriptor(utxo["script"]),
+                                 "amount": txcodec.sats_to_btc(utxo["value"]),
+                                 "coinbase": utxo["coinbase"], "height": utxo["height"],
+                                 "blockhash": self.blocks[utxo["height"]]["hash"],
+                                 "confirmations": self._confirmations(utxo["height"])})
+        return {"success": True, "txouts": len(self.utxos), "height": self.height,
+                "bestblock": self.blocks[-1]["hash"], "unspents": unspents,
+                "total_amount": txcodec.sats_to_btc(sum(self.utxos[(u["txid"], u["vout"])]["value"]
+                                                         for u in unspents))}
+
+    def rpc_generatetoaddress(self, nblocks, address, *args):
+        script = self._parse_address(address)
+        return [self._mine_block(script) for _ in range(int(nblocks))]
+
+    # ------------------------------------------------------------
+    # Wallet RPCs
+    # ------------------------------------------------------------
+
+    def rpc_getnewaddress(self, wallet, label="", address_type="bech32"):
+        return txcodec.script_to_address(wallet.new_key(address_type, label))
+
+    def rpc_getbalance(self, wallet, dummy="*", minconf=0, *args):
+        total = sum(utxo["value"] for _, _, utxo, _ in self._wallet_coins(wallet, minconf))
+        return txcodec.sats_to_btc(total)
+
+    def rpc_listunspent(self, wallet, minconf=1, maxconf=9999999, addresses=None, *args):
+        scripts = {self._parse_address(a) for a in addresses} if addresses else None
+        result = []
+        for txid, n, utxo, confirmations in self._wallet_coins(wallet, minconf, maxconf):
+            if scripts is not None and utxo["script"] not in scripts:
+                continue
+            key = wallet.scripts[utxo["script"]]
+            entry = {"txid": txid, "vout": n, "address": txcodec.script_to_address(utxo["script"]),
+                     "label": key["label"], "scriptPubKey": utxo["script"].hex(),
+                     "amount": txcodec.sats_to_btc(utxo["value"]), "confirmations": confirmations}
+            if key["redeem_script"] is not None:
+                entry["redeemScript"] = key["redeem_script"].hex()
+            entry.update({"spendable": True, "solvable": True, "safe": True})
+            result.append(entry)
+        return result
+
+    def rpc_signrawtransactionwithwallet(self, wallet, hexstring, *args):
+        try:
+            tx = txcodec.parse_tx(hexstring)
+        except ValueError:
+            raise rpc_error(RPC_DESERIALIZATION_ERROR, "TX decode failed. Make sure the tx has at least one input.")
+        errors = self._sign(wallet, tx)
+        result = {"hex": txcodec.serialize_tx(tx).hex(), "complete": not errors}
+        if errors:
+            result["errors"] = errors
+        return result
+
+    def rpc_sendtoaddress(self, wallet, address, amount, *args):
+        target = txcodec.btc_to_sats(amount)
+        if target <= 0:
+            raise rpc_error(RPC_TYPE_ERROR, "Invalid amount for send")
+        dest = self._parse_address(address)
+        # Largest-first selection over confirmed coins and our own unconfirmed change
+        coins = [c for c in self._wallet_coins(wallet, minconf=0)
+                 if c[3] > 0 or self._is_trusted(wallet, c[0])]
+        coins.sort(key=lambda c: (-c[2]["value"], c[0], c[1]))
+        change_script = wallet.new_key("bech32")
+        tx = {"version": 2, "locktime": 0, "vin": [], "vout": []}
+        selected = 0
+        for txid, n, utxo, _ in coins:
+            tx["vin"].append({"txid": txid, "vout": n, "scriptSig": b"", "sequence": DEFAULT_SEQUENCE, "witness": []})
+            selected += utxo["value"]
+            tx["vout"] = [{"value": target, "scriptPubKey": dest},
+                          {"value": 0, "scriptPubKey": change_script}]
+            self._sign(wallet, tx)
+            fee = txcodec.tx_vsize(tx) * DEFAULT_FEE_RATE
+            if selected >= target + fee:
+                break
+        else:
+            raise rpc_error(RPC_WALLET_INSUFFICIENT_FUNDS, "Insufficient funds")
+        change = selected - target - fee
+        if change > 0:
+            tx["vout"][1]["value"] = change
+        else:
+            tx["vout"].pop()
+        self._sign(wallet, tx)
+        return self._accept_to_mempool(tx)
+
+
+
+class FakeNodeProxy:
+    """Attribute-style RPC access, matching how the scripts use AuthServiceProxy."""
+
+    def __init__(self, node, wallet=None):
+        self._node = node
+        self._wallet = wallet
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return lambda *params: self._node.call(name, params, self._wallet)
+
+
+class _JSONEncoder(json.JSONEncoder):
+    def default(self, o):
+        if isinstance(o, Decimal):
+            return float(o)
+        return super().default(o)
+
+
+def make_handler(node):
+    """Build a JSON-RPC request handler bound to a FakeNode."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            match = re.match(r"^/wallet/([^/]+)/?$", self.path)
+            wallet = match.group(1) if match else None
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])), parse_float=Decimal)
+            if isinstance(body, list):
+                response = [self._dispatch(req, wallet) for req in body]
+            else:
+                response = self._dispatch(body, wallet)
+            payload = json.dumps(response, cls=_JSONEncoder).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _dispatch(self, request, wallet):
+            try:
+                result = node.call(request["method"], request.get("params", []), wallet)
+                return {"result": result, "error": None, "id": request.get("id")}
+            except JSONRPCException as e:
+                return {"result": None, "error": e.error, "id": request.get("id")}
+            except (TypeError, ValueError, KeyError) as e:
+                return {"result": None, "error": {"code": RPC_MISC_ERROR, "message": str(e)},
+                        "id": request.get("id")}
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(node, host="127.0.0.1", port=18443):
+    """Create (but do not start) an HTTP JSON-RPC server for the node."""
+    return ThreadingHTTPServer((host, port), make_handler(node))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an in-memory regtest node over JSON-RPC.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18443)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every call")
+    parser.add_argument("--wallet", default="project")
+    parser.add_argument("--premine", type=int, default=0,
+                        help="blocks to mine to the wallet at startup (101 makes 50 BTC spendable)")
+    args = parser.parse_args()
+
+    node = FakeNode(latency=args.latency, wallets=(args.wallet,))
+    if args.premine:
+        wallet_rpc = node.proxy(args.wallet)
+        wallet_rpc.generatetoaddress(args.premine, wallet_rpc.getnewaddress())
+
+    server = serve(node, args.host, args.port)
+    print(f"Fake regtest node listening on http://{args.host}:{args.port} (height {node.height})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+"""Append-only columnar archive of transaction scripts with vectorized analytics.
+
+The scripts print scriptPubKey/scriptSig/witness data and then lose it. This
+archive keeps it on disk in a layout that can be analysed across millions of
+spends without Python loops:
+
+  - fixed-width columns (one raw NumPy file per column) for sizes, types,
+    amounts and fees, read back with np.memmap;
+  - one blob file of length-prefixed raw scripts and witness stacks, referenced
+    by offset columns, for when the actual bytes or ASM are needed.
+
+There are three tables: txs (one row per transaction), inputs and outputs (one
+row per input/output, linked to txs by tx_row). Each flush ends by atomically
+replacing a manifest with the committed row counts and blob size; on open every
+file is truncated back to it, so a crash mid-flush never leaves half a transaction.
+
+A txid index maps each txid to its txs row, whose out_row column locates its
+outputs, so spends of any previously archived output get their fee, spend type
+and change flag even in a later session. The index is a set of sorted runs of
+(txid key, row) searched with np.searchsorted: every flush writes one run and
+runs of similar size are merged, so there are about log2(flushes) of them and
+nothing is loaded into memory on open. Spends of outputs that were never
+archived need their prevouts passed explicitly (e.g. from `listunspent`'s
+amount and scriptPubKey, which the BC scripts already fetch).
+
+    with ScriptArchive("archive") as archive:
+        archive.append_decoded(script_info["decoded_tx"], height=102)
+    archive = ScriptArchive("archive")
+    archive.group_stats("inputs", "scriptsig_len", "spend_type")
+"""
+import glob
+import json
+import os
+import struct
+
+import numpy as np
+
+import txcodec
+
+# Spend type of an input, inferred from the prevout script or the input's shape
+SPEND_TYPES = ("unknown", "p2pkh", "p2sh-p2wpkh", "p2sh", "p2wpkh", "p2wsh", "p2tr", "coinbase")
+# Output script types, as named by decoderawtransaction
+SCRIPT_TYPES = ("nonstandard", "pubkeyhash", "scripthash", "witness_v0_keyhash",
+                "witness_v0_scripthash", "witness_v1_taproot", "nulldata", "pubkey",
+                "witness_unknown")
+
+NO_BLOB = np.iinfo(np.uint64).max
+MANIFEST = "manifest.json"
+INDEX_DTYPE = np.dtype([("key", "<u8"), ("row", "<u8")])  # first 8 txid bytes -> txs row
+
+SCHEMA = {
+    "txs": [
+        ("txid", "S32"),
+        ("height", "<i4"),          # -1 if unconfirmed/unknown
+        ("size", "<u4"),
+        ("vsize", "<u4"),
+        ("weight", "<u4"),
+        ("n_in", "<u4"),
+        ("n_out", "<u4"),
+        ("fee", "<i8"),             # satoshis, -1 for coinbases or if any prevout value is unknown
+        ("out_row", "<u8"),         # outputs row of the tx's first output
+    ],
+    "inputs": [
+        ("tx_row", "<u8"),
+        ("n", "<u4"),
+        ("spend_type", "u1"),       # index into SPEND_TYPES
+        ("scriptsig_len", "<u4"),
+        ("witness_items", "<u2"),
+        ("witness_len", "<u4"),     # sum of witness item sizes
+        ("prevout_value", "<i8"),   # satoshis, -1 if unknown
+        ("scriptsig_blob", "<u8"),
+        ("witness_blob", "<u8"),
+    ],
+    "outputs": [
+        ("tx_row", "<u8"),
+        ("n", "<u4"),
+        ("script_type", "u1"),      # index into SCRIPT_TYPES
+        ("script_len", "<u4"),
+        ("value", "<i8"),           # satoshis
+        ("is_change", "?"),         # pays back to one of the tx's input scripts
+        ("script_blob", "<u8"),
+    ],
+}
+
+
+def classify_input(script_sig, witness, prevout_script=None):
+    """Return the SPEND_TYPES name for an input, from its prevout if known, else its shape."""
+    if prevout_script is not None:
+        kind = txcodec.script_type(prevout_script)
+        if kind == "pubkeyhash":
+            return "p2pkh"
+        if kind == "scripthash":
+            return "p2sh-p2wpkh" if len(script_sig) == 23 and script_sig[1:3] == b"\x00\x14" else "p2sh"
+        if kind == "witness_v0_keyhash":
+            return "p2wpkh"
+        if kind == "witness_v0_scripthash":
+            return "p2wsh"
+        if kind == "witness_v1_taproot":
+            return "p2tr"
+        return "unknown"
+    if not witness:
+        pushes = _pushes(script_sig)
+        if pushes is not None and len(pushes) == 2 and len(pushes[1]) in (33, 65):
+            return "p2pkh"
+        return "p2sh" if pushes else "unknown"
+    if not script_sig:
+        if len(witness) == 2 and len(witness[1]) == 33:
+            return "p2wpkh"
+        if len(witness) == 1 and len(witness[0]) in (64, 65):
+            return "p2tr"
+        return "p2wsh"
+    if len(script_sig) == 23 and script_sig[1:3] == b"\x00\x14":
+        return "p2sh-p2wpkh"
+    return "p2sh"
+
+
+def _append(path, data):
+    with open(path, "ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _truncate(path, size):
+    if os.path.exists(path) and os.path.getsize(path) > size:
+        os.truncate(path, size)
+
+
+def _pushes(script):
+    try:
+        items = list(txcodec.iter_script(script))
+    except (ValueError, IndexError, struct.error):
+        return None
+    if any(push is None for _, push in items):
+        return None
+    return [push for _, push in items]
+
+
+class ScriptArchive:
+    """Append-only on-disk archive; rows are buffered and flushed every flush_every txs."""
+
+    def __init__(self, path, flush_every=4096):
+        self.path = path
+        self.flush_every = flush_every
+        os.makedirs(path, exist_ok=True)
+        self._buffers = {table: {name: [] for name, _ in cols} for table, cols in SCHEMA.items()}
+        self._blob_buffer = bytearray()
+        self._blob_path = os.path.join(path, "blobs.bin")
+        manifest = self._recover()
+        self._blob_size = manifest["blob_size"]
+        self._rows = dict(manifest["rows"])
+        self._pending_txs = 0
+        self._flushed = dict(self._rows)
+        self._memmaps = {}
+        self._runs = [(start, end, self._load_run(start, end)) for start, end in manifest["index"]]
+        self._recent = {}  # txid bytes -> txs row for txs not flushed (and so not indexed) yet
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Flush buffered rows."""
+        self.flush()
+
+    # ------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------
+
+    def _column_path(self, table, name):
+        return os.path.join(self.path, f"{table}.{name}.bin")
+
+    def _recover(self):
+        """Truncate every column and the blob file to the last committed flush; returns the manifest."""
+        path = os.path.join(self.path, MANIFEST)
+        if os.path.exists(path):
+            with open(path) as f:
+                manifest = json.load(f)
+        else:
+            manifest = {"rows": {table: 0 for table in SCHEMA}, "blob_size": 0, "index": []}
+        for table, cols in SCHEMA.items():
+            for name, dtype in cols:
+                _truncate(self._column_path(table, name), manifest["rows"][table] * np.dtype(dtype).itemsize)
+        _truncate(self._blob_path, manifest["blob_size"])
+        committed = {self._run_path(start, end) for start, end in manifest["index"]}
+        for path in glob.glob(os.path.join(self.path, "txid_index.*.bin")):
+            if path not in committed:
+                os.remove(path)
+        return manifest
+
+    def _commit(self):
+        """Atomically record the flushed row counts; anything written past them is dropped on open."""
+        path = os.path.join(self.path, MANIFEST)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"rows": self._rows, "blob_size": self._blob_size,
+                       "index": [[start, end] for start, end, _ in self._runs]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _put_blob(self, data):
+        offset = self._blob_size + len(self._blob_buffer)
+        self._blob_buffer += struct.pack("<I", len(data)) + data
+        return offset
+
+    def _add_row(self, table, **values):
+        buffers = self._buffers[table]
+        for name, _ in SCHEMA[table]:
+            buffers[name].append(values[name])
+        self._rows[table] += 1
+        return self._rows[table] - 1
+
+    def flush(self):
+        """Write buffered rows, blobs and an index run for the new txs, then commit them in the manifest."""
+        if self._rows == self._flushed:
+            return
+        obsolete = self._index_new_txs()
+        if self._blob_buffer:
+            _append(self._blob_path, self._blob_buffer)
+            self._blob_size += len(self._blob_buffer)
+            self._blob_buffer = bytearray()
+        for table, cols in SCHEMA.items():
+            buffers = self._buffers[table]
+            if not buffers[cols[0][0]]:
+                continue
+            for name, dtype in cols:
+                _append(self._column_path(table, name), np.asarray(buffers[name], dtype=dtype).tobytes())
+                buffers[name].clear()
+        self._commit()
+        for path in obsolete:
+            os.remove(path)
+        self._recent.clear()
+        self._pending_txs = 0
+        self._flushed = dict(self._rows)
+        self._memmaps.clear()
+
+    def _cell(self, table, name, row):
+        """Read one value, from the write buffer if the row is not flushed yet."""
+        if row >= self._flushed[table]:
+            return self._buffers[table][name][row - self._flushed[table]]
+        key = (table, name)
+        if key not in self._memmaps:
+            self._memmaps[key] = np.memmap(self._column_path(table, name), dtype=dict(SCHEMA[table])[name], mode="r")
+        return self._memmaps[key][row]
+
+    def _read_blob(self, offset):
+        if offset >= self._blob_size:
+            pos = offset - self._blob_size
+            (length,) = struct.unpack_from("<I", self._blob_buffer, pos)
+            return bytes(self._blob_buffer[pos + 4:pos + 4 + length])
+        with open(self._blob_path, "rb") as f:
+            f.seek(int(offset))
+            (length,) = struct.unpack("<I", f.read(4))
+            return f.read(length)
+
+    # ------------------------------------------------------------
+    # Txid index
+    # ------------------------------------------------------------
+
+    def _run_path(self, start, end):
+        return os.path.join(self.path, f"txid_index.{start}-{end}.bin")
+
+    def _load_run(self, start, end):
+        return np.memmap(self._run_path(start, end), dtype=INDEX_DTYPE, mode="r")
+
+    def _write_run(self, start, end, run):
+        with open(self._run_path(start, end), "wb") as f:
+            f.write(run.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        return start, end, self._load_run(start, end)
+
+    def _index_new_txs(self):
+        """Write a sorted run for the txs being flushed, merging runs of similar size.
+
+        Returns the run files replaced by merges; they are removed once the manifest
+        no longer refers to them.
+        """
+        start, end = self._flushed["txs"], self._rows["txs"]
+        if start == end:
+            return []
+        txids = np.frombuffer(b"".join(self._buffers["txs"]["txid"]), dtype="<u8").reshape(-1, 4)
+        run = np.empty(end - start, dtype=INDEX_DTYPE)
+        run["key"] = txids[:, 0]
+        run["row"] = np.arange(start, end, dtype=np.uint64)
+        self._runs.append(self._write_run(start, end, np.sort(run, order="key", kind="stable")))
+        obsolete = []
+        while len(self._runs) > 1 and len(self._runs[-2][2]) <= len(self._runs[-1][2]):
+            (start, _, older), (_, end, newer) = self._runs[-2:]
+            merged = np.concatenate([older, newer])
+            merged = merged[np.argsort(merged["key"], kind="stable")]
+            obsolete += [self._run_path(*r[:2]) for r in self._runs[-2:]]
+            self._runs[-2:] = [self._write_run(start, end, merged)]
+        return obsolete
+
+    def _find_tx(self, txid):
+        """Return the txs row of txid (bytes), or None if it was never archived."""
+        if txid in self._recent:
+            return self._recent[txid]
+        key = np.frombuffer(txid[:8], dtype="<u8")[0]
+        for _, _, run in self._runs:
+            keys = run["key"]
+            lo, hi = np.searchsorted(keys, key, "left"), np.searchsorted(keys, key, "right")
+            for row in run["row"][lo:hi]:
+                if bytes(self._cell("txs", "txid", int(row))) == txid:
+                    return int(row)
+        return None
+
+    def _lookup_prevout(self, txid, vout):
+        """Return (value, script) of an archived output, or None if it was never archived."""
+        tx_row = self._find_tx(bytes.fromhex(txid))
+        if tx_row is None or vout >= self._cell("txs", "n_out", tx_row):
+            return None
+        row = int(self._cell("txs", "out_row", tx_row)) + vout
+        return int(self._cell("outputs", "value", row)), self._read_blob(int(self._cell("outputs", "script_blob", row)))
+
+    # ------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------
+
+    def append_tx(self, tx, height=-1, prevouts=None):
+        """Archive a parsed transaction (txcodec dict).
+
+        prevouts optionally gives (value_sats, script_bytes) per input; inputs spending
+        outputs already in the archive are resolved through the txid index.
+        """
+        txid = txcodec.txid_of(tx)
+        coinbase = txcodec.is_coinbase(tx)
+        resolved = []
+        for i, txin in enumerate(tx["vin"]):
+            prevout = prevouts[i] if prevouts is not None else None
+            if prevout is None and not coinbase:
+                prevout = self._lookup_prevout(txin["txid"], txin["vout"])
+            resolved.append(prevout)
+
+        fee = -1
+        if not coinbase and all(p is not None for p in resolved):
+            fee = sum(p[0] for p in resolved) - sum(out["value"] for out in tx["vout"])
+
+        weight = txcodec.tx_weight(tx)
+        tx_row = self._add_row(
+            "txs", txid=bytes.fromhex(txid), height=height, size=len(txcodec.serialize_tx(tx)),
+            vsize=(weight + 3) // 4, weight=weight, n_in=len(tx["vin"]), n_out=len(tx["vout"]), fee=fee,
+            out_row=self._rows["outputs"])
+        self._recent[bytes.fromhex(txid)] = tx_row
+
+        input_scripts = set()
+        for n, (txin, prevout) in enumerate(zip(tx["vin"], resolved)):
+            witness = txin["witness"]
+            if coinbase:
+                spend_type = "coinbase"
+            else:
+                spend_type = classify_input(txin["scriptSig"], witness, prevout[1] if prevout else None)
+            if prevout is not None:
+                input_scripts.add(prevout[1])
+            witness_blob = NO_BLOB
+            if witness:
+                witness_blob = self._put_blob(txcodec.write_varint(len(witness))
+                                              + b"".join(txcodec.write_bytes(item) for item in witness))
+            self._add_row(
+                "inputs", tx_row=tx_row, n=n, spend_type=SPEND_TYPES.index(spend_type),
+                scriptsig_len=len(txin["scriptSig"]), witness_items=len(witness),
+                witness_len=sum(len(item) for item in witness),
+                prevout_value=prevout[0] if prevout else -1,
+                scriptsig_blob=self._put_blob(txin["scriptSig"]), witness_blob=witness_blob)
+
+        for n, txout in enumerate(tx["vout"]):
+            script = txout["scriptPubKey"]
+            self._add_row(
+                "outputs", tx_row=tx_row, n=n, script_type=SCRIPT_TYPES.index(txcodec.script_type(script)),
+                script_len=len(script), value=txout["value"], is_change=script in input_scripts,
+                script_blob=self._put_blob(script))
+
+        self._pending_txs += 1
+        if self._pending_txs >= self.flush_every:
+            self.flush()
+        return tx_row
+
+    def append_decoded(self, decoded_tx, height=-1, prevouts=None):
+        """Archive a decoderawtransaction-style dict, e.g. get_script_info()["decoded_tx"]."""
+        tx = {"version": decoded_tx["version"], "locktime": decoded_tx["locktime"], "vin": [], "vout": []}
+        for txin in decoded_tx["vin"]:
+            if "coinbase" in txin:
+                entry = {"txid": "00" * 32, "vout": 0xffffffff, "scriptSig": bytes.fromhex(txin["coinbase"])}
+            else:
+                entry = {"txid": txin["txid"], "vout": txin["vout"],
+                         "scriptSig": bytes.fromhex(txin["scriptSig"]["hex"])}
+            entry["sequence"] = txin["sequence"]
+            entry["witness"] = [bytes.fromhex(item) for item in txin.get("txinwitness", [])]
+            tx["vin"].append(entry)
+        for txout in decoded_tx["vout"]:
+            tx["vout"].append({"value": txcodec.btc_to_sats(txout["value"]),
+                               "scriptPubKey": bytes.fromhex(txout["scriptPubKey"]["hex"])})
+        return self.append_tx(tx, height, prevouts)
+
+    def append_block_txs(self, transactions):
+        """Archive (height, block_hash, txid, tx) items, e.g. from BlockFollower.poll()."""
+        count = 0
+        for height, _, _, tx in transactions:
+            self.append_tx(tx, height)
+            count += 1
+        return count
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+
+    def __len__(self):
+        return self._rows["txs"]
+
+    def column(self, table, name):
+        """Return a read-only array for one column (flushes pending rows first)."""
+        self.flush()
+        dtype = dict(SCHEMA[table])[name]
+        path = self._column_path(table, name)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r")
+
+    def blob(self, offset):
+        """Read one length-prefixed blob by offset."""
+        return self._read_blob(int(offset))
+
+    def script_asm(self, table, row):
+        """Disassemble the archived script of an output or input row."""
+        if table == "outputs":
+            return txcodec.script_to_asm(self.blob(self.column("outputs", "script_blob")[row]))
+        return txcodec.script_to_asm(self.blob(self.column("inputs", "scriptsig_blob")[row]),
+                                     attempt_sighash_decode=True)
+
+    def witness(self, row):
+        """Return the witness stack (list of bytes) of an input row."""
+        offset = self.column("inputs", "witness_blob")[row]
+        if offset == NO_BLOB:
+            return []
+        data = self.blob(offset)
+        count, pos = txcodec.read_varint(data, 0)
+        items = []
+        for _ in range(count):
+            item, pos = txcodec.read_bytes(data, pos)
+            items.append(item)
+        return items
+
+    def mask(self, table, **equals):
+        """Boolean row mask where each named column equals the given value (type names allowed)."""
+        mask = np.ones(self._rows[table], dtype=bool)
+        for name, value in equals.items():
+            if name == "spend_type" and isinstance(value, str):
+                value = SPEND_TYPES.index(value)
+            elif name == "script_type" and isinstance(value, str):
+                value = SCRIPT_TYPES.index(value)
+            mask &= self.column(table, name) == value
+        return mask
+
+    def histogram(self, table, name, bins=20, where=None):
+        """np.histogram of a column, optionally restricted to a boolean row mask."""
+        values = self.column(table, name)
+        if where is not None:
+            values = values[where]
+        return np.histogram(values, bins=bins)
+
+    def group_stats(self, table, value, key):
+        """Per-key count/sum/mean/min/max of a column, e.g. scriptsig_len by spend_type."""
+        keys = np.asarray(self.column(table, key), dtype=np.int64)
+        values = np.asarray(self.column(table, value), dtype=np.float64)
+        if not len(keys):
+            return {}
+        counts = np.bincount(keys)
+        sums = np.bincount(keys, weights=values)
+        mins = np.full(len(counts), np.inf)
+        maxs = np.full(len(counts), -np.inf)
+        np.minimum.at(mins, keys, values)
+        np.maximum.at(maxs, keys, values)
+        labels = SPEND_TYPES if key == "spend_type" else SCRIPT_TYPES if key == "script_type" else None
+        stats = {}
+        for k in np.nonzero(counts)[0]:
+            stats[labels[k] if labels else int(k)] = {
+                "count": int(counts[k]), "sum": float(sums[k]), "mean": float(sums[k] / counts[k]),
+                "min": float(mins[k]), "max": float(maxs[k])}
+        return stats
+
+    def fee_rates(self):
+        """Fee per vbyte (sat/vB) for every non-coinbase tx whose fee is known."""
+        fees = self.column("txs", "fee")
+        vsizes = self.column("txs", "vsize")
+        known = fees >= 0
+        return fees[known] / vsizes[known]
+
+    def change_share(self):
+        """Fraction of non-coinbase outputs that pay back to one of their transaction's input scripts."""
+        coinbase_txs = self.column("inputs", "tx_row")[self.mask("inputs", spend_type="coinbase")]
+        is_change = self.column("outputs", "is_change")[~np.isin(self.column("outputs", "tx_row"), coinbase_txs)]
+        return float(is_change.mean()) if len(is_change) else 0.0
+
+    def tx_column_for(self, table, name):
+        """Broadcast a txs column onto input/output rows via tx_row (e.g. height per input)."""
+        return self.column("txs", name)[self.column(table, "tx_row")]
@@ -3,12 +3,15 @@ import sys
 import time
 from decimal import Decimal
 
+from utxo_scan import UTXOScanner
+
 # RPC connection details
 RPC_USER = "username" # fill username
 RPC_PASSWORD = "password" #fill password
 RPC_HOST = "127.0.0.1"
 RPC_PORT = "18443"
 WALLET_NAME = "project"  # Explicitly use this wallet
+UTXO_LOOKUP = "wallet"  # "wallet" uses listunspent; "scan" uses scantxoutset (works for watch-only addresses)
 
 def connect_to_rpc():
     """Connect to Bitcoin Core RPC with correct authentication."""
@@ -36,7 +39,7 @@ def load_wallet(rpc_connection, wallet_name=WALLET_NAME):
 
 def get_utxos(wallet_rpc, addresses):
     """Fetch unspent transactions (UTXOs) for given addresses."""
-    utxos = wallet_rpc.listunspent(1, 9999999, addresses)
+    utxos = find_utxos(wallet_rpc, addresses)
     if not utxos:
         return "[No UTXOs Found]"
     
@@ -48,6 +51,17 @@ def get_utxos(wallet_rpc, addresses):
     utxo_table += "------------------------------------------------------------"
     return utxo_table
 
+_scanner = None  # one scanner per connection, so its per-tip cache is reused
+
+def find_utxos(wallet_rpc, addresses):
+    """Find confirmed UTXOs for addresses using the configured lookup mode."""
+    global _scanner
+    if UTXO_LOOKUP == "scan":
+        if _scanner is None or _scanner.rpc is not wallet_rpc:
+            _scanner = UTXOScanner(wallet_rpc)
+        return _scanner.listunspent(addresses)
+    return wallet_rpc.listunspent(1, 9999999, addresses)
+
 def get_script_info(wallet_rpc, txid):
     """Get locking and unlocking script information for a transaction."""
     try:
@@ -108,7 +122,7 @@ def main():
     print("------------------------------------------------------------")
 
     # Check available UTXOs for Address B'
-    utxos = wallet_rpc.listunspent(1, 9999999, [addr_b])
+    utxos = find_utxos(wallet_rpc, [addr_b])
     if not utxos:
         print("| ERROR               | No UTXOs found for Address B'.")
         print("------------------------------------------------------------")
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_node import FakeNode  # noqa: E402
+
+
+@pytest.fixture
+def node():
+    return FakeNode()
+
+
+@pytest.fixture
+def wallet_rpc(node):
+    """Wallet proxy with 50 BTC of mature coinbase funds, like the README's regtest setup."""
+    rpc = node.proxy("project")
+    rpc.generatetoaddress(101, rpc.getnewaddress())
+    return rpc
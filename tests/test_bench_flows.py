@@ -0,0 +1,21 @@
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("bitcoinrpc")
+
+from bench_flows import FLOWS, run_script  # noqa: E402
+
+
+@pytest.mark.parametrize("flow", FLOWS)
+def test_scripts_run_against_fake_node(monkeypatch, tmp_path, node, wallet_rpc, flow):
+    monkeypatch.chdir(tmp_path)
+    ab, bc = flow
+    ab_calls = run_script(node, ab)
+    addr_a, addr_b, addr_c = (tmp_path / f"{ab.split('_')[0]}_addresses.txt").read_text().split()
+    bc_calls = run_script(node, bc)
+
+    assert sum(ab_calls.values()) + sum(bc_calls.values()) == 30
+    assert ab_calls["getbalance"] + bc_calls["getbalance"] == 4
+    assert ab_calls["listunspent"] + bc_calls["listunspent"] == 5
+    assert [u["amount"] for u in wallet_rpc.listunspent(1, 9999999, [addr_c])] == [Decimal("0.3")]
@@ -0,0 +1,73 @@
+from block_follower import BlockFollower, extract_scripts
+
+
+def test_reorg_emits_each_tx_once(wallet_rpc):
+    follower = BlockFollower(wallet_rpc)
+    list(follower.poll())
+    addr = wallet_rpc.getnewaddress()
+    sent = {wallet_rpc.sendtoaddress(addr, 0.1) for _ in range(3)}
+    block_hash = wallet_rpc.generatetoaddress(1, addr)[0]
+    first = [item[2] for item in follower.poll()]
+    assert sent <= set(first)
+
+    wallet_rpc.invalidateblock(block_hash)
+    wallet_rpc.generatetoaddress(2, wallet_rpc.getnewaddress())
+    second = [item[2] for item in follower.poll()]
+    assert follower.reorgs == 1
+    assert not sent & set(second)
+    assert len(second) == 2  # only the two new coinbases
+
+
+def test_extract_scripts_captures_unlocking_data(wallet_rpc):
+    follower = BlockFollower(wallet_rpc)
+    list(follower.poll())
+    addr_b, addr_c = (wallet_rpc.getnewaddress("", "p2sh-segwit") for _ in range(2))
+    wallet_rpc.sendtoaddress(addr_b, 1.0)
+    wallet_rpc.generatetoaddress(1, wallet_rpc.getnewaddress())
+    utxo = wallet_rpc.listunspent(1, 9999999, [addr_b])[0]
+    raw = wallet_rpc.createrawtransaction([{"txid": utxo["txid"], "vout": utxo["vout"]}], {addr_c: 0.9})
+    wallet_rpc.sendrawtransaction(wallet_rpc.signrawtransactionwithwallet(raw)["hex"])
+    wallet_rpc.generatetoaddress(1, wallet_rpc.getnewaddress())
+
+    done = lambda: follower.tip == wallet_rpc.getbestblockhash()
+    records = list(extract_scripts(follower.follow(poll_interval=0, stop=done), [addr_b, addr_c]))
+    assert [r["kind"] for r in records] == ["output", "input", "output"]
+    assert len(records[1]["witness_data"]) == 2
+    assert records[2]["script_type"] == "scripthash"
+
+
+def test_catch_up_beyond_reorg_window(wallet_rpc):
+    follower = BlockFollower(wallet_rpc)
+    wallet_rpc.generatetoaddress(5, wallet_rpc.getnewaddress())
+    list(follower.poll())
+    wallet_rpc.generatetoaddress(101, wallet_rpc.getnewaddress())
+    assert len(list(follower.poll())) == 101
+    assert follower.tip == wallet_rpc.getbestblockhash()
+
+
+
+
+def test_partial_consumption_resumes(wallet_rpc):
+    follower = BlockFollower(wallet_rpc)
+    list(follower.poll())
+    addr = wallet_rpc.getnewaddress()
+    for _ in range(4):
+        wallet_rpc.sendtoaddress(addr, 0.1)
+    wallet_rpc.generatetoaddress(1, addr)
+
+    received = []
+    for item in follower.poll():
+        received.append(item[2])
+        if len(received) == 2:
+            break
+    received += [item[2] for item in follower.poll()]
+    assert len(received) == len(set(received)) == 5
+    assert list(follower.poll()) == []
+
+
+def test_start_height_read_from_header(node, wallet_rpc):
+    follower = BlockFollower(wallet_rpc, start_hash=wallet_rpc.getblockhash(100))
+    node.call_counts.clear()
+    assert len(list(follower.poll())) == 1
+    assert node.call_counts["getblockheader"] == 1
+    assert node.call_counts["getblock"] == follower.blocks_fetched == 1
@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+import pytest
+
+from fake_node import JSONRPCException
+
+FEE = Decimal("0.0001")
+
+
+def _send(wallet_rpc, utxo, outputs):
+    raw = wallet_rpc.createrawtransaction([{"txid": utxo["txid"], "vout": utxo["vout"]}], outputs)
+    signed = wallet_rpc.signrawtransactionwithwallet(raw)
+    assert signed["complete"]
+    return wallet_rpc.sendrawtransaction(signed["hex"])
+
+
+@pytest.mark.parametrize("address_type, unlocking", [("legacy", "scriptSig"), ("p2sh-segwit", "txinwitness")])
+def test_ab_bc_flow(wallet_rpc, address_type, unlocking):
+    addr_a, addr_b, addr_c = (wallet_rpc.getnewaddress(label, address_type) for label in ("addr_a", "addr_b", "addr_c"))
+    wallet_rpc.sendtoaddress(addr_a, 1.0)
+    wallet_rpc.generatetoaddress(1, addr_a)
+
+    utxo = wallet_rpc.listunspent(1, 9999999, [addr_a])[0]
+    txid_a_to_b = _send(wallet_rpc, utxo, {addr_b: 0.5, addr_a: float(Decimal(utxo["amount"]) - Decimal("0.5") - FEE)})
+    wallet_rpc.generatetoaddress(1, addr_b)
+
+    utxo = wallet_rpc.listunspent(1, 9999999, [addr_b])[0]
+    txid_b_to_c = _send(wallet_rpc, utxo, {addr_c: 0.3, addr_b: float(Decimal(utxo["amount"]) - Decimal("0.3") - FEE)})
+    wallet_rpc.generatetoaddress(1, addr_c)
+
+    decoded = wallet_rpc.decoderawtransaction(wallet_rpc.getrawtransaction(txid_b_to_c))
+    assert decoded["txid"] == txid_b_to_c
+    assert decoded["vin"][0]["txid"] == txid_a_to_b
+    assert decoded["vin"][0][unlocking]
+    expected = "pubkeyhash" if address_type == "legacy" else "scripthash"
+    assert decoded["vout"][0]["scriptPubKey"]["type"] == expected
+    assert wallet_rpc.listunspent(1, 9999999, [addr_c])[0]["amount"] == Decimal("0.3")
+
+
+def test_coinbase_maturity(node):
+    rpc = node.proxy("project")
+    rpc.generatetoaddress(100, rpc.getnewaddress())
+    assert rpc.getbalance() == 0
+    rpc.generatetoaddress(1, rpc.getnewaddress())
+    assert rpc.getbalance() == 50
+
+
+def test_double_spend_rejected(wallet_rpc):
+    addr = wallet_rpc.getnewaddress()
+    utxo = wallet_rpc.listunspent()[0]
+    _send(wallet_rpc, utxo, {addr: 1.0})
+    with pytest.raises(JSONRPCException):
+        _send(wallet_rpc, utxo, {addr: 2.0})
+
+
+
+def test_invalidateblock_restores_state(node, wallet_rpc):
+    addr = wallet_rpc.getnewaddress()
+    txid = wallet_rpc.sendtoaddress(addr, 1.0)
+    utxos_before = dict(node.utxos)
+    block_hash = wallet_rpc.generatetoaddress(1, addr)[0]
+
+    wallet_rpc.invalidateblock(block_hash)
+    assert node.utxos == utxos_before
+    assert set(node.mempool) == {txid}
+    assert wallet_rpc.getbestblockhash() != block_hash
+
+    replacement = wallet_rpc.generatetoaddress(1, addr)[0]
+    assert replacement != block_hash
+    assert not node.mempool
+    assert [u["txid"] for u in wallet_rpc.listunspent(1, 9999999, [addr])] == [txid]
+
+
+def test_invalidateblock_undoes_in_block_spends(node, wallet_rpc):
+    addr = wallet_rpc.getnewaddress()
+    # The second send spends the first one's unconfirmed change, so the block holds a parent and child
+    first = wallet_rpc.sendtoaddress(addr, 1.0)
+    second = wallet_rpc.sendtoaddress(addr, 1.0)
+    utxos_before = dict(node.utxos)
+    block_hash = wallet_rpc.generatetoaddress(1, addr)[0]
+
+    wallet_rpc.invalidateblock(block_hash)
+    assert node.utxos == utxos_before
+    assert set(node.mempool) == {first, second}
+    assert wallet_rpc.scantxoutset("start", [f"addr({addr})"])["unspents"] == []
+
+    wallet_rpc.generatetoaddress(1, addr)
+    assert len(wallet_rpc.scantxoutset("start", [f"addr({addr})"])["unspents"]) == 3
+
+
+def test_getblockheader_matches_block(wallet_rpc):
+    block_hash = wallet_rpc.getbestblockhash()
+    header = wallet_rpc.getblockheader(block_hash)
+    block = wallet_rpc.getblock(block_hash)
+    assert header == {k: v for k, v in block.items() if k not in ("size", "tx")}
+    assert wallet_rpc.getblock(block_hash, 0).startswith(wallet_rpc.getblockheader(block_hash, False))
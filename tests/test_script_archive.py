@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import txcodec  # noqa: E402
+from script_archive import ScriptArchive  # noqa: E402
+
+
+def _spend(wallet_rpc, utxo, outputs):
+    raw = wallet_rpc.createrawtransaction([{"txid": utxo["txid"], "vout": utxo["vout"]}], outputs)
+    return wallet_rpc.sendrawtransaction(wallet_rpc.signrawtransactionwithwallet(raw)["hex"])
+
+
+def test_spend_type_sizes(tmp_path, wallet_rpc):
+    with ScriptArchive(str(tmp_path), flush_every=3) as archive:
+        for address_type in ("legacy", "p2sh-segwit"):
+            addr = wallet_rpc.getnewaddress("", address_type)
+            archive.append_decoded(wallet_rpc.decoderawtransaction(
+                wallet_rpc.getrawtransaction(wallet_rpc.sendtoaddress(addr, 1.0))))
+            wallet_rpc.generatetoaddress(1, wallet_rpc.getnewaddress())
+            utxo = wallet_rpc.listunspent(1, 9999999, [addr])[0]
+            txid = _spend(wallet_rpc, utxo, {wallet_rpc.getnewaddress(): 0.9})
+            archive.append_decoded(wallet_rpc.decoderawtransaction(wallet_rpc.getrawtransaction(txid)))
+
+        scriptsig = archive.group_stats("inputs", "scriptsig_len", "spend_type")
+        witness = archive.group_stats("inputs", "witness_len", "spend_type")
+        assert scriptsig["p2pkh"]["mean"] > scriptsig["p2sh-p2wpkh"]["mean"] == 23
+        assert witness["p2pkh"]["max"] == 0 and witness["p2sh-p2wpkh"]["mean"] > 0
+        row = int(archive.mask("inputs", spend_type="p2sh-p2wpkh").nonzero()[0][0])
+        assert len(archive.witness(row)) == 2
+
+
+def test_fees_and_change_survive_reopening(tmp_path, wallet_rpc):
+    addr_b, addr_c = (wallet_rpc.getnewaddress("", "legacy") for _ in range(2))
+    funding = wallet_rpc.sendtoaddress(addr_b, 1.0)
+    wallet_rpc.generatetoaddress(1, wallet_rpc.getnewaddress())
+    with ScriptArchive(str(tmp_path)) as archive:
+        archive.append_decoded(wallet_rpc.decoderawtransaction(wallet_rpc.getrawtransaction(funding)))
+
+    utxo = wallet_rpc.listunspent(1, 9999999, [addr_b])[0]
+    change = float(Decimal(utxo["amount"]) - Decimal("0.3001"))
+    txid = _spend(wallet_rpc, utxo, {addr_c: 0.3, addr_b: change})
+    block = wallet_rpc.getblock(wallet_rpc.generatetoaddress(1, wallet_rpc.getnewaddress())[0])
+    with ScriptArchive(str(tmp_path)) as archive:
+        for mined in block["tx"]:
+            archive.append_decoded(wallet_rpc.decoderawtransaction(wallet_rpc.getrawtransaction(mined)))
+        assert len(archive) == 3
+        assert archive.fee_rates().tolist() == [pytest.approx(10000 / 225)]
+        assert archive.mask("outputs", is_change=True).sum() == 1
+        assert archive.change_share() == 0.25  # the coinbase's outputs are not counted
+        stats = archive.group_stats("inputs", "scriptsig_len", "spend_type")
+        assert stats["p2pkh"]["count"] == 1
+
+
+def test_partial_flush_is_discarded_on_open(tmp_path, wallet_rpc):
+    addr = wallet_rpc.getnewaddress("", "legacy")
+    with ScriptArchive(str(tmp_path)) as archive:
+        archive.append_decoded(wallet_rpc.decoderawtransaction(
+            wallet_rpc.getrawtransaction(wallet_rpc.sendtoaddress(addr, 1.0))))
+    sizes = {p.name: p.stat().st_size for p in tmp_path.glob("*.bin")}
+
+    # A flush that crashed after the blobs and txs columns, before inputs, outputs and the manifest
+    for path in [tmp_path / "blobs.bin", *tmp_path.glob("txs.*.bin")]:
+        with open(path, "ab") as f:
+            f.write(b"\0" * 64)
+
+    archive = ScriptArchive(str(tmp_path))
+    assert {p.name: p.stat().st_size for p in tmp_path.glob("*.bin")} == sizes
+    assert len(archive) == 1
+    assert len(archive.column("outputs", "tx_row")) == 2
+
+
+def _chain(length, prev_txid="ab" * 32):
+    """Transactions each spending output 0 of the previous one, paying a 1000 sat fee."""
+    script = txcodec.p2pkh_script(b"\x11" * 20)
+    txs = []
+    for i in range(length):
+        tx = {"version": 2, "locktime": 0, "vin": [{"txid": prev_txid, "vout": 0, "scriptSig": b"\x01\x02",
+                                                   "sequence": 0xffffffff, "witness": []}],
+              "vout": [{"value": 10 ** 8 - 1000 * (i + 1), "scriptPubKey": script},
+                       {"value": 0, "scriptPubKey": b"\x6a"}]}
+        txs.append(tx)
+        prev_txid = txcodec.txid_of(tx)
+    return txs
+
+
+def test_txid_index_resolves_spends_across_flushes_and_sessions(tmp_path):
+    first, second = _chain(40)[:25], _chain(40)[25:]
+    with ScriptArchive(str(tmp_path), flush_every=2) as archive:
+        for tx in first:
+            archive.append_tx(tx)
+        assert len(archive._runs) <= 4  # runs are merged, not one per flush
+    with ScriptArchive(str(tmp_path), flush_every=2) as archive:
+        for tx in second:
+            archive.append_tx(tx)
+        fees = archive.column("txs", "fee")
+    assert fees[0] == -1 and (fees[1:] == 1000).all()
+    assert len(list(tmp_path.glob("txid_index.*.bin"))) == len(archive._runs)
@@ -0,0 +1,23 @@
+import txcodec
+
+
+def test_descriptor_checksum_matches_bip380_vector():
+    assert txcodec.descriptor_checksum("addr(mkmZxiEcEd8ZqjQWVZuC6so5dFMKEFpN2j)") == "02wpgw69"
+
+
+def test_address_script_roundtrip():
+    for script in (txcodec.p2pkh_script(b"\x11" * 20), txcodec.p2sh_script(b"\x22" * 20),
+                   txcodec.p2wpkh_script(b"\x33" * 20)):
+        assert txcodec.address_to_script(txcodec.script_to_address(script)) == script
+
+
+def test_tx_serialization_roundtrip():
+    tx = {"version": 2, "locktime": 0,
+          "vin": [{"txid": "ab" * 32, "vout": 1, "scriptSig": b"\x16" + b"\x00\x14" + b"\x01" * 20,
+                   "sequence": 0xfffffffd, "witness": [b"\x30" * 71, b"\x02" * 33]}],
+          "vout": [{"value": 50000000, "scriptPubKey": txcodec.p2sh_script(b"\x22" * 20)}]}
+    raw = txcodec.serialize_tx(tx)
+    parsed = txcodec.parse_tx(raw.hex())
+    assert txcodec.serialize_tx(parsed) == raw
+    assert txcodec.txid_of(parsed) == txcodec.txid_of(tx)
+    assert txcodec.tx_vsize(tx) < len(raw)
@@ -0,0 +1,87 @@
+import pytest
+
+from utxo_scan import SCAN_ATTEMPTS, UTXOScanner
+
+
+def test_bulk_balances_take_one_scan(wallet_rpc):
+    funded = [wallet_rpc.getnewaddress("", t) for t in ("legacy", "p2sh-segwit", "bech32")]
+    for address in funded:
+        wallet_rpc.sendtoaddress(address, 0.25)
+    wallet_rpc.generatetoaddress(1, wallet_rpc.getnewaddress())
+    addresses = funded + [wallet_rpc.getnewaddress() for _ in range(500)]
+
+    scanner = UTXOScanner(wallet_rpc)
+    balances = scanner.get_balances(addresses)
+    assert scanner.scans == 1
+    assert [balances[a] for a in funded] == [0.25, 0.25, 0.25]
+    assert sum(balances.values()) == 0.75
+
+
+def test_cache_reused_until_tip_changes(wallet_rpc):
+    address = wallet_rpc.getnewaddress()
+    wallet_rpc.sendtoaddress(address, 1.0)
+    wallet_rpc.generatetoaddress(1, wallet_rpc.getnewaddress())
+
+    scanner = UTXOScanner(wallet_rpc)
+    utxos = scanner.listunspent([address])
+    assert scanner.listunspent([address]) == utxos
+    assert scanner.scans == 1
+    assert [(u["txid"], u["vout"]) for u in utxos] == \
+        [(u["txid"], u["vout"]) for u in wallet_rpc.listunspent(1, 9999999, [address])]
+
+    wallet_rpc.generatetoaddress(1, wallet_rpc.getnewaddress())
+    scanner.listunspent([address])
+    assert scanner.scans == 2
+
+
+@pytest.mark.parametrize("script", ["legacy_BC", "segwit_BC"])
+def test_bc_scripts_reuse_one_scanner(monkeypatch, wallet_rpc, script):
+    pytest.importorskip("bitcoinrpc")
+    module = __import__(script)
+    monkeypatch.setattr(module, "UTXO_LOOKUP", "scan")
+    monkeypatch.setattr(module, "_scanner", None)
+    address = wallet_rpc.getnewaddress()
+    wallet_rpc.sendtoaddress(address, 1.0)
+    wallet_rpc.generatetoaddress(1, wallet_rpc.getnewaddress())
+
+    expected = wallet_rpc.listunspent(1, 9999999, [address])
+    for _ in range(3):
+        assert [u["txid"] for u in module.find_utxos(wallet_rpc, [address])] == [u["txid"] for u in expected]
+    assert module._scanner.scans == 1
+
+
+def test_get_balances_rejects_unattributable_descriptors(wallet_rpc):
+    with pytest.raises(ValueError):
+        UTXOScanner(wallet_rpc).get_balances(["wpkh(tpubD6NzVbkrYhZ4X/0/*)"])
+
+
+class _MiningRPC:
+    """Mines a block right before each of the first `blocks` scans, as if one arrived mid-scan."""
+
+    def __init__(self, rpc, blocks):
+        self._rpc = rpc
+        self._blocks = blocks
+
+    def scantxoutset(self, *params):
+        if self._blocks:
+            self._blocks -= 1
+            self._rpc.generatetoaddress(1, self._rpc.getnewaddress())
+        return self._rpc.scantxoutset(*params)
+
+    def __getattr__(self, name):
+        return getattr(self._rpc, name)
+
+
+def test_rescans_when_tip_moves_mid_scan(wallet_rpc):
+    address = wallet_rpc.getnewaddress()
+    wallet_rpc.sendtoaddress(address, 1.0)
+    scanner = UTXOScanner(_MiningRPC(wallet_rpc, blocks=1))
+    assert [u["amount"] for u in scanner.listunspent([address])] == [1]
+    assert scanner.scans == 2
+
+
+def test_gives_up_when_tip_keeps_moving(wallet_rpc):
+    scanner = UTXOScanner(_MiningRPC(wallet_rpc, blocks=SCAN_ATTEMPTS))
+    with pytest.raises(RuntimeError):
+        scanner.listunspent([wallet_rpc.getnewaddress()])
+    assert scanner.scans == SCAN_ATTEMPTS
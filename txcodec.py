@@ -0,0 +1,567 @@
+import hashlib
+import struct
+from decimal import Decimal
+
+# Regtest address prefixes
+P2PKH_VERSION = 0x6f
+P2SH_VERSION = 0xc4
+BECH32_HRP = "bcrt"
+
+COIN = 100000000
+WITNESS_SCALE_FACTOR = 4
+
+OPCODE_NAMES = {
+    0x00: "0", 0x4f: "-1", 0x61: "OP_NOP", 0x63: "OP_IF", 0x64: "OP_NOTIF",
+    0x67: "OP_ELSE", 0x68: "OP_ENDIF", 0x69: "OP_VERIFY", 0x6a: "OP_RETURN",
+    0x75: "OP_DROP", 0x76: "OP_DUP", 0x87: "OP_EQUAL", 0x88: "OP_EQUALVERIFY",
+    0xa6: "OP_RIPEMD160", 0xa7: "OP_SHA1", 0xa8: "OP_SHA256", 0xa9: "OP_HASH160",
+    0xaa: "OP_HASH256", 0xac: "OP_CHECKSIG", 0xad: "OP_CHECKSIGVERIFY",
+    0xae: "OP_CHECKMULTISIG", 0xaf: "OP_CHECKMULTISIGVERIFY",
+    0xb1: "OP_CHECKLOCKTIMEVERIFY", 0xb2: "OP_CHECKSEQUENCEVERIFY",
+}
+SIGHASH_NAMES = {
+    0x01: "ALL", 0x02: "NONE", 0x03: "SINGLE",
+    0x81: "ALL|ANYONECANPAY", 0x82: "NONE|ANYONECANPAY", 0x83: "SINGLE|ANYONECANPAY",
+}
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+BECH32M_CONST = 0x2bc830a3
+
+
+def sha256d(data):
+    """Double SHA-256, as used for txids and block hashes."""
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+
+
+def btc_to_sats(amount):
+    """Convert a BTC amount (float, str or Decimal) to an integer number of satoshis."""
+    return int((Decimal(str(amount)) * COIN).to_integral_value())
+
+
+def sats_to_btc(sats):
+    """Convert satoshis to a Decimal BTC amount with 8 decimal places."""
+    return (Decimal(sats) / COIN).quantize(Decimal("0.00000001"))
+
+
+# ------------------------------------------------------------
+# Serialization primitives
+# ------------------------------------------------------------
+
+def write_varint(n):
+    """Encode an integer as a Bitcoin CompactSize."""
+    if n < 0xfd:
+        return struct.pack("<B", n)
+    if n <= 0xffff:
+        return b"\xfd" + struct.pack("<H", n)
+    if n <= 0xffffffff:
+        return b"\xfe" + struct.pack("<I", n)
+    return b"\xff" + struct.pack("<Q", n)
+
+
+def read_varint(data, pos):
+    """Decode a CompactSize at pos, returning (value, new_pos)."""
+    prefix = data[pos]
+    if prefix < 0xfd:
+        return prefix, pos + 1
+    if prefix == 0xfd:
+        return struct.unpack_from("<H", data, pos + 1)[0], pos + 3
+    if prefix == 0xfe:
+        return struct.unpack_from("<I", data, pos + 1)[0], pos + 5
+    return struct.unpack_from("<Q", data, pos + 1)[0], pos + 9
+
+
+def write_bytes(b):
+    """Length-prefix a byte string."""
+    return write_varint(len(b)) + b
+
+
+def read_bytes(data, pos):
+    """Read a length-prefixed byte string, returning (bytes, new_pos)."""
+    length, pos = read_varint(data, pos)
+    if pos + length > len(data):
+        raise ValueError("Unexpected end of data")
+    return data[pos:pos + length], pos + length
+
+
+def push_data(b):
+    """Build a minimal script push for a byte string."""
+    if len(b) < 0x4c:
+        return struct.pack("<B", len(b)) + b
+    if len(b) <= 0xff:
+        return b"\x4c" + struct.pack("<B", len(b)) + b
+    if len(b) <= 0xffff:
+        return b"\x4d" + struct.pack("<H", len(b)) + b
+    return b"\x4e" + struct.pack("<I", len(b)) + b
+
+
+# ------------------------------------------------------------
+# Transactions
+# ------------------------------------------------------------
+# A transaction is a plain dict:
+#   {"version": int, "locktime": int,
+#    "vin":  [{"txid": hex, "vout": int, "scriptSig": bytes, "sequence": int, "witness": [bytes]}],
+#    "vout": [{"value": sats, "scriptPubKey": bytes}]}
+
+def serialize_tx(tx, include_witness=True):
+    """Serialize a transaction dict to raw bytes."""
+    has_witness = include_witness and any(txin.get("witness") for txin in tx["vin"])
+    out = struct.pack("<i", tx["version"])
+    if has_witness:
+        out += b"\x00\x01"
+    out += write_varint(len(tx["vin"]))
+    for txin in tx["vin"]:
+        out += bytes.fromhex(txin["txid"])[::-1]
+        out += struct.pack("<I", txin["vout"])
+        out += write_bytes(txin.get("scriptSig", b""))
+        out += struct.pack("<I", txin.get("sequence", 0xffffffff))
+    out += write_varint(len(tx["vout"]))
+    for txout in tx["vout"]:
+        out += struct.pack("<q", txout["value"])
+        out += write_bytes(txout["scriptPubKey"])
+    if has_witness:
+        for txin in tx["vin"]:
+            witness = txin.get("witness", [])
+            out += write_varint(len(witness))
+            for item in witness:
+                out += write_bytes(item)
+    out += struct.pack("<I", tx["locktime"])
+    return out
+
+
+def deserialize_tx(data, pos=0):
+    """Parse a raw transaction starting at pos, returning (tx, new_pos)."""
+    start = pos
+    version = struct.unpack_from("<i", data, pos)[0]
+    pos += 4
+    has_witness = False
+    if data[pos] == 0x00 and data[pos + 1] == 0x01:
+        has_witness = True
+        pos += 2
+
+    vin = []
+    n_in, pos = read_varint(data, pos)
+    for _ in range(n_in):
+        txid = data[pos:pos + 32][::-1].hex()
+        vout = struct.unpack_from("<I", data, pos + 32)[0]
+        script_sig, pos = read_bytes(data, pos + 36)
+        sequence = struct.unpack_from("<I", data, pos)[0]
+        pos += 4
+        vin.append({"txid": txid, "vout": vout, "scriptSig": script_sig,
+                    "sequence": sequence, "witness": []})
+
+    vout = []
+    n_out, pos = read_varint(data, pos)
+    for _ in range(n_out):
+        value = struct.unpack_from("<q", data, pos)[0]
+        script_pubkey, pos = read_bytes(data, pos + 8)
+        vout.append({"value": value, "scriptPubKey": script_pubkey})
+
+    if has_witness:
+        for txin in vin:
+            n_items, pos = read_varint(data, pos)
+            for _ in range(n_items):
+                item, pos = read_bytes(data, pos)
+                txin["witness"].append(item)
+
+    locktime = struct.unpack_from("<I", data, pos)[0]
+    pos += 4
+    tx = {"version": version, "locktime": locktime, "vin": vin, "vout": vout}
+    tx["size"] = pos - start
+    return tx, pos
+
+
+def parse_tx(raw):
+    """Parse a complete raw transaction (bytes or hex), rejecting trailing data."""
+    data = bytes.fromhex(raw) if isinstance(raw, str) else raw
+    try:
+        tx, pos = deserialize_tx(data)
+    except (IndexError, struct.error) as e:
+        raise ValueError(f"TX decode failed: {e}")
+    if pos != len(data):
+        raise ValueError("TX decode failed: trailing data")
+    return tx
+
+
+def txid_of(tx):
+    """Compute the txid (hash of the non-witness serialization)."""
+    return sha256d(serialize_tx(tx, include_witness=False))[::-1].hex()
+
+
+def tx_weight(tx):
+    """Compute the BIP141 weight of a transaction."""
+    base_size = len(serialize_tx(tx, include_witness=False))
+    total_size = len(serialize_tx(tx))
+    return base_size * (WITNESS_SCALE_FACTOR - 1) + total_size
+
+
+def tx_vsize(tx):
+    """Compute the virtual size of a transaction in vbytes."""
+    return (tx_weight(tx) + WITNESS_SCALE_FACTOR - 1) // WITNESS_SCALE_FACTOR
+
+
+def is_coinbase(tx):
+    """Return True if the transaction is a coinbase."""
+    return (len(tx["vin"]) == 1 and tx["vin"][0]["txid"] == "00" * 32
+            and tx["vin"][0]["vout"] == 0xffffffff)
+
+
+# ------------------------------------------------------------
+# Blocks
+# ------------------------------------------------------------
+
+def merkle_root(txids):
+    """Compute the merkle root from a list of hex txids."""
+    if not txids:
+        return "00" * 32
+    level = [bytes.fromhex(t)[::-1] for t in txids]
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [sha256d(level[i] + level[i + 1]) for i in range(0, len(level), 2)]
+    return level[0][::-1].hex()
+
+
+def serialize_header(header):
+    """Serialize an 80-byte block header dict."""
+    return (struct.pack("<i", header["version"])
+            + bytes.fromhex(header["previousblockhash"])[::-1]
+            + bytes.fromhex(header["merkleroot"])[::-1]
+            + struct.pack("<III", header["time"], header["bits"], header["nonce"]))
+
+
+def deserialize_header(data, pos=0):
+    """Parse an 80-byte block header, returning (header, new_pos)."""
+    version = struct.unpack_from("<i", data, pos)[0]
+    prev_hash = data[pos + 4:pos + 36][::-1].hex()
+    merkle = data[pos + 36:pos + 68][::-1].hex()
+    time_, bits, nonce = struct.unpack_from("<III", data, pos + 68)
+    header = {"version": version, "previousblockhash": prev_hash, "merkleroot": merkle,
+              "time": time_, "bits": bits, "nonce": nonce,
+              "hash": sha256d(data[pos:pos + 80])[::-1].hex()}
+    return header, pos + 80
+
+
+def serialize_block(header, txs):
+    """Serialize a block from a header dict and a list of tx dicts."""
+    out = serialize_header(header) + write_varint(len(txs))
+    for tx in txs:
+        out += serialize_tx(tx)
+    return out
+
+
+def parse_block(raw):
+    """Parse a raw block (bytes or hex) into (header, txs)."""
+    data = bytes.fromhex(raw) if isinstance(raw, str) else raw
+    header, pos = deserialize_header(data)
+    n_tx, pos = read_varint(data, pos)
+    txs = []
+    for _ in range(n_tx):
+        tx, pos = deserialize_tx(data, pos)
+        txs.append(tx)
+    return header, txs
+
+
+# ------------------------------------------------------------
+# Scripts
+# ------------------------------------------------------------
+
+def iter_script(script):
+    """Yield (opcode, pushed_data) pairs; pushed_data is None for non-push opcodes."""
+    pos = 0
+    while pos < len(script):
+        op = script[pos]
+        pos += 1
+        if 0x01 <= op <= 0x4b:
+            size = op
+        elif op == 0x4c:
+            size = script[pos]
+            pos += 1
+        elif op == 0x4d:
+            size = struct.unpack_from("<H", script, pos)[0]
+            pos += 2
+        elif op == 0x4e:
+            size = struct.unpack_from("<I", script, pos)[0]
+            pos += 4
+        else:
+            yield op, None
+            continue
+        if pos + size > len(script):
+            raise ValueError("Push past end of script")
+        yield op, script[pos:pos + size]
+        pos += size
+
+
+def _decode_sighash(push):
+    """Render a DER signature push the way Core's scriptSig ASM does."""
+    if len(push) > 8 and push[0] == 0x30 and push[-1] in SIGHASH_NAMES:
+        return push[:-1].hex() + "[" + SIGHASH_NAMES[push[-1]] + "]"
+    return push.hex()
+
+
+def script_to_asm(script, attempt_sighash_decode=False):
+    """Disassemble a script into Core-style ASM."""
+    parts = []
+    try:
+        for op, push in iter_script(script):
+            if push is not None:
+                parts.append(_decode_sighash(push) if attempt_sighash_decode else push.hex())
+            elif 0x51 <= op <= 0x60:
+                parts.append(str(op - 0x50))
+            else:
+                parts.append(OPCODE_NAMES.get(op, f"OP_UNKNOWN_{op:#04x}"))
+    except (ValueError, IndexError, struct.error):
+        parts.append("[error]")
+    return " ".join(parts)
+
+
+def script_type(script):
+    """Classify a scriptPubKey using Core's type names."""
+    n = len(script)
+    if n == 25 and script[:3] == b"\x76\xa9\x14" and script[23:] == b"\x88\xac":
+        return "pubkeyhash"
+    if n == 23 and script[:2] == b"\xa9\x14" and script[22] == 0x87:
+        return "scripthash"
+    if n == 22 and script[:2] == b"\x00\x14":
+        return "witness_v0_keyhash"
+    if n == 34 and script[:2] == b"\x00\x20":
+        return "witness_v0_scripthash"
+    if n == 34 and script[:2] == b"\x51\x20":
+        return "witness_v1_taproot"
+    if n >= 1 and script[0] == 0x6a:
+        return "nulldata"
+    if n in (35, 67) and script[-1] == 0xac and script[0] in (33, 65):
+        return "pubkey"
+    if 4 <= n <= 42 and (script[0] == 0x00 or 0x51 <= script[0] <= 0x60) and script[1] == n - 2:
+        return "witness_unknown"
+    return "nonstandard"
+
+
+def p2pkh_script(pubkey_hash):
+    """OP_DUP OP_HASH160 <hash> OP_EQUALVERIFY OP_CHECKSIG"""
+    return b"\x76\xa9\x14" + pubkey_hash + b"\x88\xac"
+
+
+def p2sh_script(script_hash):
+    """OP_HASH160 <hash> OP_EQUAL"""
+    return b"\xa9\x14" + script_hash + b"\x87"
+
+
+def p2wpkh_script(pubkey_hash):
+    """0 <20-byte hash>"""
+    return b"\x00\x14" + pubkey_hash
+
+
+# ------------------------------------------------------------
+# Addresses
+# ------------------------------------------------------------
+
+def base58check_encode(payload):
+    """Base58Check-encode a payload (version byte included)."""
+    data = payload + sha256d(payload)[:4]
+    n = int.from_bytes(data, "big")
+    out = ""
+    while n:
+        n, r = divmod(n, 58)
+        out = BASE58_ALPHABET[r] + out
+    pad = len(data) - len(data.lstrip(b"\x00"))
+    return "1" * pad + out
+
+
+def base58check_decode(s):
+    """Decode a Base58Check string, verifying its checksum."""
+    n = 0
+    for c in s:
+        if c not in BASE58_ALPHABET:
+            raise ValueError(f"Invalid base58 character: {c}")
+        n = n * 58 + BASE58_ALPHABET.index(c)
+    body = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    data = b"\x00" * (len(s) - len(s.lstrip("1"))) + body
+    if len(data) < 5 or sha256d(data[:-4])[:4] != data[-4:]:
+        raise ValueError("Invalid base58 checksum")
+    return data[:-4]
+
+
+def _bech32_polymod(values):
+    gen = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3]
+    chk = 1
+    for v in values:
+        top = chk >> 25
+        chk = (chk & 0x1ffffff) << 5 ^ v
+        for i in range(5):
+            chk ^= gen[i] if ((top >> i) & 1) else 0
+    return chk
+
+
+def _bech32_hrp_expand(hrp):
+    return [ord(x) >> 5 for x in hrp] + [0] + [ord(x) & 31 for x in hrp]
+
+
+def _convertbits(data, frombits, tobits, pad=True):
+    acc, bits, ret = 0, 0, []
+    maxv = (1 << tobits) - 1
+    for value in data:
+        acc = (acc << frombits) | value
+        bits += frombits
+        while bits >= tobits:
+            bits -= tobits
+            ret.append((acc >> bits) & maxv)
+    if pad and bits:
+        ret.append((acc << (tobits - bits)) & maxv)
+    elif not pad and (bits >= frombits or ((acc << (tobits - bits)) & maxv)):
+        raise ValueError("Invalid bech32 padding")
+    return ret
+
+
+def segwit_encode(hrp, witver, program):
+    """Encode a segwit address (bech32 for v0, bech32m for v1+)."""
+    const = 1 if witver == 0 else BECH32M_CONST
+    data = [witver] + _convertbits(program, 8, 5)
+    polymod = _bech32_polymod(_bech32_hrp_expand(hrp) + data + [0] * 6) ^ const
+    checksum = [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+    return hrp + "1" + "".join(BECH32_CHARSET[d] for d in data + checksum)
+
+
+def segwit_decode(hrp, addr):
+    """Decode a segwit address, returning (witver, program)."""
+    addr = addr.lower()
+    pos = addr.rfind("1")
+    if addr[:pos] != hrp or pos + 7 > len(addr):
+        raise ValueError("Invalid bech32 address")
+    try:
+        data = [BECH32_CHARSET.index(c) for c in addr[pos + 1:]]
+    except ValueError:
+        raise ValueError("Invalid bech32 character")
+    witver = data[0]
+    const = 1 if witver == 0 else BECH32M_CONST
+    if _bech32_polymod(_bech32_hrp_expand(hrp) + data) != const:
+        raise ValueError("Invalid bech32 checksum")
+    program = bytes(_convertbits(data[1:-6], 5, 8, pad=False))
+    if witver > 16 or not 2 <= len(program) <= 40:
+        raise ValueError("Invalid witness program")
+    return witver, program
+
+
+def address_to_script(address):
+    """Convert a regtest address to its scriptPubKey bytes."""
+    if address.lower().startswith(BECH32_HRP + "1"):
+        witver, program = segwit_decode(BECH32_HRP, address)
+        return bytes([witver + 0x50 if witver else 0, len(program)]) + program
+    payload = base58check_decode(address)
+    if len(payload) != 21:
+        raise ValueError("Invalid address length")
+    if payload[0] == P2PKH_VERSION:
+        return p2pkh_script(payload[1:])
+    if payload[0] == P2SH_VERSION:
+        return p2sh_script(payload[1:])
+    raise ValueError("Invalid address version")
+
+
+def script_to_address(script):
+    """Return the regtest address for a standard scriptPubKey, or None."""
+    kind = script_type(script)
+    if kind == "pubkeyhash":
+        return base58check_encode(bytes([P2PKH_VERSION]) + script[3:23])
+    if kind == "scripthash":
+        return base58check_encode(bytes([P2SH_VERSION]) + script[2:22])
+    if kind.startswith("witness_"):
+        witver = script[0] - 0x50 if script[0] else 0
+        return segwit_encode(BECH32_HRP, witver, script[2:])
+    return None
+
+
+# ------------------------------------------------------------
+# decoderawtransaction-style output
+# ------------------------------------------------------------
+
+def decode_script_pubkey(script):
+    """Build the scriptPubKey object used in decoded transaction outputs."""
+    result = {"asm": script_to_asm(script), "hex": script.hex(), "type": script_type(script)}
+    address = script_to_address(script)
+    if address:
+        result["address"] = address
+    return result
+
+
+def decode_tx(tx):
+    """Render a parsed transaction in the same shape as Core's decoderawtransaction."""
+    txid = txid_of(tx)
+    vin = []
+    for txin in tx["vin"]:
+        if is_coinbase(tx):
+            entry = {"coinbase": txin["scriptSig"].hex()}
+        else:
+            entry = {
+                "txid": txin["txid"],
+                "vout": txin["vout"],
+                "scriptSig": {
+                    "asm": script_to_asm(txin["scriptSig"], attempt_sighash_decode=True),
+                    "hex": txin["scriptSig"].hex(),
+                },
+            }
+        if txin["witness"]:
+            entry["txinwitness"] = [item.hex() for item in txin["witness"]]
+        entry["sequence"] = txin["sequence"]
+        vin.append(entry)
+
+    vout = [{"value": sats_to_btc(txout["value"]), "n": n,
+             "scriptPubKey": decode_script_pubkey(txout["scriptPubKey"])}
+            for n, txout in enumerate(tx["vout"])]
+
+    weight = tx_weight(tx)
+    return {
+        "txid": txid,
+        "hash": sha256d(serialize_tx(tx))[::-1].hex(),
+        "version": tx["version"],
+        "size": len(serialize_tx(tx)),
+        "vsize": (weight + WITNESS_SCALE_FACTOR - 1) // WITNESS_SCALE_FACTOR,
+        "weight": weight,
+        "locktime": tx["locktime"],
+        "vin": vin,
+        "vout": vout,
+    }
+
+
+# ------------------------------------------------------------
+# Output descriptors
+# ------------------------------------------------------------
+
+DESC_INPUT_CHARSET = "0123456789()[],'/*abcdefgh@:$%{}IJKLMNOPQRSTUVWXYZ&+-.;<=>?!^_|~ijklmnopqrstuvwxyzABCDEFGH`#\"\\ "
+DESC_CHECKSUM_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+
+def _descsum_polymod(symbols):
+    chk = 1
+    for value in symbols:
+        top = chk >> 35
+        chk = (chk & 0x7ffffffff) << 5 ^ value
+        for i, gen in enumerate((0xf5dee51989, 0xa9fdca3312, 0x1bab10e32d, 0x3706b1677a, 0x644d626ffd)):
+            chk ^= gen if ((top >> i) & 1) else 0
+    return chk
+
+
+def descriptor_checksum(desc):
+    """Compute the 8-character checksum Core appends to output descriptors."""
+    symbols, groups = [], []
+    for c in desc:
+        v = DESC_INPUT_CHARSET.find(c)
+        if v < 0:
+            raise ValueError(f"Invalid descriptor character: {c}")
+        symbols.append(v & 31)
+        groups.append(v >> 5)
+        if len(groups) == 3:
+            symbols.append(groups[0] * 9 + groups[1] * 3 + groups[2])
+            groups = []
+    if len(groups) == 1:
+        symbols.append(groups[0])
+    elif len(groups) == 2:
+        symbols.append(groups[0] * 3 + groups[1])
+    checksum = _descsum_polymod(symbols + [0] * 8) ^ 1
+    return "".join(DESC_CHECKSUM_CHARSET[(checksum >> (5 * (7 - i))) & 31] for i in range(8))
+
+
+def infer_descriptor(script):
+    """Return the addr()/raw() descriptor (with checksum) for a scriptPubKey."""
+    address = script_to_address(script)
+    desc = f"addr({address})" if address else f"raw({script.hex()})"
+    return desc + "#" + descriptor_checksum(desc)
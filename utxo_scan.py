@@ -0,0 +1,170 @@
+"""Watch-only UTXO and balance lookups through `scantxoutset`.
+
+Instead of asking the wallet (which only knows its own addresses and walks every
+wallet transaction), many addresses or descriptors are looked up with a single
+`scantxoutset` call against the node's chainstate. Results are cached until the
+chain tip changes and returned in the same shape as `listunspent`, so they can be
+fed straight into `get_utxos`-style formatting.
+
+    scanner = UTXOScanner(rpc_connection)
+    utxos = scanner.listunspent([addr_b, addr_c])
+    balances = scanner.get_balances(many_addresses)  # one scan for all of them
+"""
+from decimal import Decimal
+
+import txcodec
+
+COINBASE_MATURITY = 100
+SCAN_ATTEMPTS = 3  # scans repeated this many times at most when blocks keep arriving mid-scan
+
+
+def address_descriptor(address):
+    """Wrap a plain address as an addr() descriptor; descriptors pass through unchanged."""
+    return address if "(" in address else f"addr({address})"
+
+
+def descriptor_script(desc):
+    """Return the scriptPubKey hex for an addr()/raw() descriptor, or None for other descriptors."""
+    body = desc.split("#", 1)[0]
+    if body.startswith("addr(") and body.endswith(")"):
+        try:
+            return txcodec.address_to_script(body[5:-1]).hex()
+        except ValueError:
+            return None
+    if body.startswith("raw(") and body.endswith(")"):
+        return body[4:-1].lower()
+    return None
+
+
+class UTXOScanner:
+    """Batches address/descriptor lookups into single scantxoutset calls, cached per chain tip.
+
+    Addresses and raw() descriptors are cached individually by scriptPubKey, so a
+    later query only scans the ones not seen at the current tip. Other descriptors
+    (e.g. ranged pkh/wpkh) are cached by the exact set requested together.
+    """
+
+    def __init__(self, rpc_connection):
+        self.rpc = rpc_connection
+        self.scans = 0
+        self._tip = None
+        self._height = None
+        self._by_script = {}  # scriptPubKey hex -> [utxo]
+        self._by_group = {}   # frozenset of descriptors -> [utxo]
+
+    def _refresh_tip(self):
+        """Drop cached results if the chain tip moved since they were scanned."""
+        tip = self.rpc.getbestblockhash()
+        if tip != self._tip:
+            self._tip = tip
+            self._height = None
+            self._by_script.clear()
+            self._by_group.clear()
+
+    def _scan(self, descriptors):
+        """Run one scantxoutset over descriptors; None if the tip moved under the cache."""
+        result = self.rpc.scantxoutset("start", descriptors)
+        self.scans += 1
+        self._height = result["height"]
+        if result["bestblock"] != self._tip:
+            # A block arrived between getbestblockhash and the scan; cached entries are stale
+            self._tip = result["bestblock"]
+            self._by_script.clear()
+            self._by_group.clear()
+            return None
+        return result["unspents"]
+
+    def _to_listunspent(self, unspent):
+        script = bytes.fromhex(unspent["scriptPubKey"])
+        entry = {
+            "txid": unspent["txid"],
+            "vout": unspent["vout"],
+            "scriptPubKey": unspent["scriptPubKey"],
+            "amount": Decimal(unspent["amount"]),
+            "confirmations": unspent.get("confirmations", self._height - unspent["height"] + 1),
+            "desc": unspent["desc"],
+            "coinbase": unspent.get("coinbase", False),
+        }
+        address = txcodec.script_to_address(script)
+        if address:
+            entry["address"] = address
+        return entry
+
+    def _fill(self, scripts, group):
+        """Scan whatever scripts/group are not cached at the current tip; False if the tip moved."""
+        missing = [desc for script, desc in scripts.items() if script not in self._by_script]
+        if missing:
+            unspents = self._scan(missing)
+            if unspents is None:
+                return False
+            for script in scripts:
+                self._by_script.setdefault(script, [])
+            for unspent in unspents:
+                self._by_script.setdefault(unspent["scriptPubKey"], []).append(self._to_listunspent(unspent))
+        if group and group not in self._by_group:
+            unspents = self._scan(sorted(group))
+            if unspents is None:
+                return False
+            self._by_group[group] = [self._to_listunspent(u) for u in unspents]
+        return True
+
+    def listunspent(self, addresses, minconf=1):
+        """Return listunspent-shaped UTXOs for addresses and/or descriptors.
+
+        Needs one scan for addresses/raw() descriptors and one for other descriptors.
+        If the tip moves mid-scan these are repeated at the new tip, up to
+        SCAN_ATTEMPTS times before giving up with RuntimeError.
+        """
+        self._refresh_tip()
+        descriptors = [address_descriptor(a) for a in addresses]
+        scripts = {}
+        others = []
+        for desc in descriptors:
+            script = descriptor_script(desc)
+            if script is None:
+                others.append(desc)
+            else:
+                scripts[script] = desc
+        group = frozenset(others)
+
+        for _ in range(SCAN_ATTEMPTS):
+            if self._fill(scripts, group):
+                break
+        else:
+            raise RuntimeError(f"Chain tip moved during each of {SCAN_ATTEMPTS} scantxoutset attempts")
+
+        seen = set()
+        utxos = []
+        for utxo in [u for s in scripts for u in self._by_script.get(s, [])] + self._by_group.get(group, []):
+            outpoint = (utxo["txid"], utxo["vout"])
+            if outpoint in seen or utxo["confirmations"] < minconf:
+                continue
+            # listunspent hides immature coinbase outputs; scantxoutset does not
+            if utxo["coinbase"] and utxo["confirmations"] <= COINBASE_MATURITY:
+                continue
+            seen.add(outpoint)
+            utxos.append(utxo)
+        return utxos
+
+    def get_balances(self, addresses, minconf=1):
+        """Return {address: Decimal balance} for many addresses from a single scan.
+
+        Only addresses and addr()/raw() descriptors can be attributed to a single
+        script; use get_balance() for ranged or key-based descriptors.
+        """
+        owner = {}
+        for address in addresses:
+            script = descriptor_script(address_descriptor(address))
+            if script is None:
+                raise ValueError(f"Cannot attribute a per-address balance to descriptor {address}")
+            owner[script] = address
+        balances = {address: Decimal("0") for address in addresses}
+        for utxo in self.listunspent(addresses, minconf):
+            address = owner.get(utxo["scriptPubKey"])
+            if address is not None:
+                balances[address] += utxo["amount"]
+        return balances
+
+    def get_balance(self, addresses, minconf=1):
+        """Return the total balance held by addresses and/or descriptors."""
+        return sum((u["amount"] for u in self.listunspent(addresses, minconf)), Decimal("0"))